@@ -0,0 +1,457 @@
+# Motor de reproducción asyncio: reloj, planificador, teclado, render y métricas como tareas.
+# Es el motor común de todos los modos: rc1–rc5 son presets del pipeline de efectos.
+# lo primero: fija el instante de arranque antes de los imports pesados
+import launch_clock
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pygame
+from rich.console import Console
+
+from audio_latency import load_output_offset
+from lrc_layers import find_extra_lrc_files, stacked_layers, stacked_layers_from
+from lrc_watch import POLL_INTERVAL, LiveTimeline
+from pcm_cache import seek as seek_music
+from prerender import FramePrefetcher
+from quality_governor import QualityGovernor
+from effect_pipeline import ALIGN_STAGES, COLOR_STAGES, PRESETS, REVEAL_STAGES, PipelineStrategy, preset_config
+from startup import StartupTimer, prepare_audio, run_concurrently
+
+console = Console()
+
+# Teclas: espacio/p pausa, ←/→ (o a/d) saltan SEEK_STEP segundos, q sale;
+# 1–5 cambian de preset y r/c/l rotan revelado, color y alineación
+SEEK_STEP = 5.0
+# Corrección del reloj contra la posición que informa el mixer
+CLOCK_SYNC = True
+CLOCK_SYNC_INTERVAL = 1.0
+CLOCK_DRIFT_TOLERANCE = 0.08
+CLOCK_SLEW = 0.25
+# Resumen de retrasos del render al terminar
+ENGINE_METRICS = True
+# Baja la calidad de los efectos si los frames llegan tarde (ver quality_governor.py)
+QUALITY_GOVERNOR = True
+GOVERNOR_INTERVAL = 0.5
+# Avisos del parser que se muestran antes de empezar
+REPORT_LINES = 5
+
+KEYS = {
+    " ": "pause", "p": "pause",
+    "\x1b[D": "back", "a": "back",
+    "\x1b[C": "forward", "d": "forward",
+    "q": "quit",
+    "r": "reveal", "c": "color", "l": "align",
+}
+PRESET_KEYS = {name[-1]: name for name in PRESETS}
+
+
+class PlaybackClock:
+    """Reloj de la canción (segundos) que se puede pausar y mover con el audio."""
+
+    def __init__(self, output_offset: float):
+        self.output_offset = output_offset
+        self._origin = 0.0
+        self._paused_at: Optional[float] = None
+        self._base = 0.0          # posición desde la que se lanzó el último play()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def start(self):
+        pygame.mixer.music.play()
+        # el reloj de letras se retrasa lo que tarda el audio en salir por el altavoz
+        self._origin = time.perf_counter() + self.output_offset
+        self._base = 0.0
+
+    def now(self) -> float:
+        if self._paused_at is not None:
+            return self._paused_at
+        return time.perf_counter() - self._origin
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.now()
+            pygame.mixer.music.pause()
+
+    def resume(self):
+        if self._paused_at is not None:
+            pygame.mixer.music.unpause()
+            self._origin = time.perf_counter() - self._paused_at
+            self._paused_at = None
+
+    def seek(self, t: float):
+        t = max(t, 0.0)
+        seek_music(t)
+        self._base = t
+        self._origin = time.perf_counter() + self.output_offset - t
+        if self._paused_at is not None:
+            pygame.mixer.music.pause()
+            # lo mismo que devolvería now() en marcha: el reanudar no salta
+            self._paused_at = t - self.output_offset
+
+    def audio_position(self) -> Optional[float]:
+        """Posición según el mixer (None si no la sabe)."""
+        pos = pygame.mixer.music.get_pos()
+        if pos < 0:
+            return None
+        return self._base + pos / 1000 - self.output_offset
+
+    def nudge(self, delta: float):
+        self._origin -= delta
+
+
+class AsyncPlayer:
+    """
+    Una canción en un solo event loop. Cada parte es una tarea:
+
+    - scheduler: programa con loop.call_at el inicio exacto de cada línea
+    - renderer: revela las líneas con el pipeline de efectos y anota el retraso de
+      cada frame respecto a su instante (self.lags)
+    - keyboard: pausa, salto, cambio de efecto y salida sin bloquear nada (add_reader)
+    - watcher: recarga en caliente del LRC
+    - clock_sync: corrige la deriva del reloj contra el mixer
+    - quality: con esos retrasos, el gobernador baja o sube la calidad de los efectos
+    """
+
+    def __init__(self, strategy: PipelineStrategy, timeline: LiveTimeline,
+                 extras: Sequence[Sequence[Any]], clock: PlaybackClock, timer: StartupTimer,
+                 governor: Optional[QualityGovernor] = None):
+        self.strategy = strategy
+        self.timeline = timeline
+        self.lines = timeline.entries
+        self.extras = extras
+        self.clock = clock
+        self.timer = timer
+        self.loop = asyncio.get_running_loop()
+        self.prefetcher = FramePrefetcher(self.lines, strategy.build).start()
+        self.layers = stacked_layers(self.lines, extras, key=strategy.key)
+        self.queue: "asyncio.Queue[Tuple[int, list]]" = asyncio.Queue()
+        self.idx = 0
+        self.generation = 0        # cambia al saltar/recargar: lo que esté en curso se abandona
+        self.rendering = False
+        self.stopped = asyncio.Event()
+        self._waiters: Set[asyncio.Future] = set()
+        self.lags: List[float] = []
+        self.governor = governor
+        self.frame_interval = 0.0   # tope de fps del gobernador (0 = sin tope)
+        if governor is not None:
+            self.apply_quality(governor.settings)
+
+    # --- esperas ---
+    async def _sleep_until(self, song_t: float):
+        """Duerme hasta el instante song_t del reloj (o hasta un cambio de estado)."""
+        while self.clock.paused:
+            await self._wait_change(None)
+        delay = song_t - self.clock.now()
+        if delay <= 0:
+            return
+        await self._wait_change(self.loop.time() + delay)
+
+    async def _wait_change(self, deadline: Optional[float]):
+        fut = self.loop.create_future()
+        handle = self.loop.call_at(deadline, _resolve, fut) if deadline is not None else None
+        self._waiters.add(fut)
+        try:
+            await fut
+        finally:
+            self._waiters.discard(fut)
+            if handle is not None:
+                handle.cancel()
+
+    def _wake(self):
+        for fut in list(self._waiters):
+            _resolve(fut)
+
+    def resync(self):
+        """
+        Re-sincroniza por tiempo (salto o LRC editado) sin parar el audio. La línea que
+        ya debería verse en ese instante se vuelve a poner en cola: el render la
+        muestra directamente con lo que le toca tener revelado.
+        """
+        self.generation += 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        line, _, _ = self.strategy.visible_at(self.clock.now())
+        self.idx = max(line, 0)
+        self.prefetcher.invalidate(self.idx)
+        self.layers = stacked_layers_from(self.lines, self.extras, key=self.strategy.key, start=self.idx)
+        self._wake()
+
+    # --- tareas ---
+    async def scheduler(self):
+        while True:
+            if self.idx >= len(self.lines):
+                await self._wait_change(None)
+                continue
+            generation = self.generation
+            await self._sleep_until(self.strategy.key(self.lines[self.idx]))
+            if generation != self.generation or self.clock.now() < self.strategy.key(self.lines[self.idx]):
+                continue
+            below = [self.strategy.layer_text(layer, extra) for layer, extra in next(self.layers, [])]
+            self.queue.put_nowait((self.idx, below))
+            self.idx += 1
+
+    async def renderer(self):
+        while True:
+            idx, below = await self.queue.get()
+            self.rendering = True
+            try:
+                await self._render_line(idx, below)
+            finally:
+                self.rendering = False
+
+    async def _render_line(self, idx: int, below: list):
+        generation = self.generation
+        rendered = self.prefetcher.get(idx)
+        times = rendered["times"]
+        self.timer.mark("first_lyric")
+        self.strategy.begin(rendered, below)
+        shown, n = 0, len(times)
+        next_frame = -np.inf
+        while shown < n and generation == self.generation:
+            now = self.clock.now()
+            k = int(np.searchsorted(times, now, side="right"))
+            closing = k <= shown and not self.queue.empty()
+            if closing:
+                # ya toca la línea siguiente: cerramos esta de golpe
+                k = n
+            if k > shown and (closing or now >= next_frame):
+                t0 = time.perf_counter()
+                self.strategy.show(rendered, k, below)
+                cost = time.perf_counter() - t0
+                # retraso con el que el frame queda en pantalla (ya escrito)
+                lag = max(now + cost - times[k - 1], 0.0)
+                self.lags.append(lag)
+                if self.governor is not None:
+                    self.governor.observe(lag, cost)
+                shown = k
+                next_frame = now + self.frame_interval
+                continue
+            await self._sleep_until(max(times[shown], next_frame))
+        self.strategy.end(rendered, below)
+
+    def restyle(self, **changes):
+        """Cambia etapas del pipeline; se nota desde la próxima línea."""
+        self.strategy.configure(**changes)
+        self.prefetcher.invalidate(self.idx)
+
+    def apply_quality(self, settings):
+        """Aplica un nivel del gobernador: tope de fps aquí y recortes en el pipeline."""
+        self.frame_interval = 1 / settings["fps"] if settings["fps"] else 0.0
+        self.strategy.set_quality(settings)
+        self.prefetcher.invalidate(self.idx)
+
+    async def keyboard(self):
+        if not sys.stdin.isatty():
+            return
+        try:
+            import termios
+            import tty
+        except ImportError:
+            # sin termios (Windows): sin controles de teclado
+            return
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        keys: "asyncio.Queue[str]" = asyncio.Queue()
+        tty.setcbreak(fd)
+        self.loop.add_reader(fd, lambda: keys.put_nowait(os.read(fd, 16).decode(errors="ignore")))
+        try:
+            while True:
+                key = await keys.get()
+                action = KEYS.get(key)
+                if key in PRESET_KEYS:
+                    self.restyle(**preset_config(PRESET_KEYS[key]))
+                elif action in ("reveal", "color", "align"):
+                    options = {"reveal": list(REVEAL_STAGES), "color": list(COLOR_STAGES),
+                               "align": list(ALIGN_STAGES)}[action]
+                    current = self.strategy.config[action]
+                    self.restyle(**{action: options[(options.index(current) + 1) % len(options)]})
+                elif action == "pause":
+                    if self.clock.paused:
+                        self.clock.resume()
+                    else:
+                        self.clock.pause()
+                    self._wake()
+                elif action in ("back", "forward"):
+                    step = SEEK_STEP if action == "forward" else -SEEK_STEP
+                    self.clock.seek(self.clock.now() + step)
+                    self.resync()
+                elif action == "quit":
+                    self.stopped.set()
+        finally:
+            self.loop.remove_reader(fd)
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    async def watcher(self):
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            if self.timeline.poll():
+                show_report(self.timeline.report)
+                self.strategy.prepare(self.lines)
+                self.resync()
+
+    async def clock_sync(self):
+        last = None
+        while True:
+            await asyncio.sleep(CLOCK_SYNC_INTERVAL)
+            if self.clock.paused:
+                last = None
+                continue
+            audio = self.clock.audio_position()
+            # solo si el mixer avanza de verdad (algunos drivers devuelven 0 siempre)
+            if audio is not None and last is not None and audio > last:
+                drift = audio - self.clock.now()
+                if abs(drift) > CLOCK_DRIFT_TOLERANCE:
+                    self.clock.nudge(drift * CLOCK_SLEW)
+            last = audio
+
+    async def quality(self):
+        while True:
+            await asyncio.sleep(GOVERNOR_INTERVAL)
+            if self.clock.paused:
+                continue
+            settings = self.governor.evaluate(self.clock.now())
+            if settings is not None:
+                self.apply_quality(settings)
+
+    async def finished(self):
+        while True:
+            await asyncio.sleep(0.2)
+            if (self.idx >= len(self.lines) and self.queue.empty() and not self.rendering
+                    and not self.clock.paused and not pygame.mixer.music.get_busy()):
+                return
+
+    async def run(self):
+        tasks = [self.loop.create_task(coro) for coro in (
+            self.scheduler(), self.renderer(), self.keyboard(), self.watcher(),
+            *((self.clock_sync(),) if CLOCK_SYNC else ()),
+            *((self.quality(),) if self.governor is not None else ()),
+        )]
+        done_task = self.loop.create_task(self.finished())
+        stop_task = self.loop.create_task(self.stopped.wait())
+        error: Optional[BaseException] = None
+        try:
+            waiting = {*tasks, done_task, stop_task}
+            while done_task in waiting and stop_task in waiting:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                # una tarea que falla (p. ej. el render) para la reproducción; las que
+                # terminan sin error (el teclado sin terminal) simplemente salen del set
+                failed = [task for task in done if not task.cancelled() and task.exception() is not None]
+                if failed:
+                    error = failed[0].exception()
+                    break
+        finally:
+            for task in (*tasks, done_task, stop_task):
+                task.cancel()
+            await asyncio.gather(*tasks, done_task, stop_task, return_exceptions=True)
+            self.prefetcher.close()
+            pygame.mixer.music.stop()
+        if error is not None:
+            raise error
+
+    def report(self):
+        if not ENGINE_METRICS or not self.lags:
+            return
+        lags = np.asarray(self.lags) * 1000
+        console.print(f"[dim]🎞 {len(lags)} frames · retraso medio {lags.mean():.1f}ms · "
+                      f"p95 {np.percentile(lags, 95):.1f}ms · máx {lags.max():.1f}ms[/dim]")
+        for change in self.governor.transitions if self.governor is not None else ():
+            console.print(f"[dim]⚙️ {change['song_t']:.1f}s calidad {change['from']} → {change['to']}: "
+                          f"{change['reason']}[/dim]")
+
+
+def show_report(report: List[str]):
+    """Muestra (y vacía) los recortes del parser de la última carga o recarga."""
+    if not report:
+        return
+    console.print(f"[yellow]⚠️ LRC recortado ({len(report)} avisos):[/yellow]")
+    for message in report[:REPORT_LINES]:
+        console.print(f"[dim]  {message}[/dim]")
+    report.clear()
+
+
+def _resolve(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
+
+
+def play_and_show(audio_file: Path, lrc_file: Path, extra_lrc_files: Sequence[Path] = (),
+                  preset: str = "rc5", governor: bool = QUALITY_GOVERNOR, **stages):
+    """
+    Reproduce con el preset indicado; stages (reveal, color, align, pending...)
+    sustituyen etapas concretas del preset. Con governor la calidad de los
+    efectos se adapta a lo que aguante la máquina.
+    """
+    timer = StartupTimer(preset)
+    strategy = PipelineStrategy(preset_config(preset, **stages), console)
+
+    # recortes por los límites del parser (líneas gigantes, demasiadas marcas...)
+    report: List[str] = []
+
+    def prepare_lyrics():
+        timeline = LiveTimeline(lrc_file, lambda raw: strategy.parse_line(raw, report),
+                                key=strategy.key, report=report)
+        strategy.prepare(timeline.entries)
+        return timeline, [strategy.parse_lrc(path, report) for path in extra_lrc_files]
+
+    audio_job, lyrics_job = run_concurrently(lambda: prepare_audio(audio_file), prepare_lyrics)
+    try:
+        audio_job.result()
+    except Exception as e:
+        console.print(f"[bold red]Error cargando audio:[/bold red] {e}")
+        return
+
+    timeline, extras = lyrics_job.result()
+    timer.mark("ready")
+    show_report(report)
+    if not timeline.entries:
+        console.print("[bold yellow]No se encontraron líneas en el archivo LRC.[/bold yellow]")
+        return
+
+    async def main():
+        clock = PlaybackClock(load_output_offset())
+        player = AsyncPlayer(strategy, timeline, extras, clock, timer,
+                             QualityGovernor(preset) if governor else None)
+        clock.start()
+        timer.mark("first_audio", clock.output_offset)
+        await player.run()
+        player.report()
+
+    asyncio.run(main())
+    timer.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduce con el motor asíncrono (teclas: espacio, ←, →, q).")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="rc5", help="combinación de efectos de partida")
+    parser.add_argument("--reveal", choices=list(REVEAL_STAGES), help="granularidad del revelado")
+    parser.add_argument("--color", choices=list(COLOR_STAGES), help="etapa de color")
+    parser.add_argument("--align", choices=list(ALIGN_STAGES), help="alineación")
+    parser.add_argument("--no-governor", action="store_true", help="calidad completa aunque los frames lleguen tarde")
+    parser.add_argument("audio", type=Path, nargs="?", default=Path("lib/assets/sample.mp3"))
+    parser.add_argument("lrc", type=Path, nargs="?", default=Path("lib/assets/sample.lrc"))
+    args = parser.parse_args()
+
+    audio_path, lrc_path = args.audio, args.lrc
+    if not audio_path.exists() or not lrc_path.exists():
+        # sin archivos propios se usa la versión preview del modo (como en rcN.py)
+        if args.preset in ("rc4", "rc5"):
+            audio_path = Path("lib/assets/default/sample_word_by_word.mp3")
+            lrc_path = Path("lib/assets/default/sample_wor__by_word_example.lrc")
+        else:
+            audio_path = Path("lib/assets/default/sample.mp3")
+            lrc_path = Path("lib/assets/default/sample.lrc")
+        console.print("[yellow]⚠️ Usando Version Preview[/yellow]")
+    else:
+        console.print("[bold green]Reproduciendo y mostrando letra...[/bold green]")
+    console.print("[dim]espacio: pausa · ←/→: saltar · 1–5: preset · r/c/l: revelado, color, alineación · q: salir[/dim]")
+    play_and_show(audio_path, lrc_path, find_extra_lrc_files(lrc_path), preset=args.preset,
+                  governor=not args.no_governor, reveal=args.reveal, color=args.color, align=args.align)
@@ -0,0 +1,173 @@
+# Perfiles de audio de baja latencia y compensación del retardo de salida
+import json
+import os
+import statistics
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pygame
+from rich.console import Console
+
+console = Console()
+
+# Perfil activo: "default" (lo que elija pygame), "low_latency" o "safe".
+# low_latency (buffer de 256 muestras) puede dar cortes en equipos lentos: se
+# activa a mano aquí o con LYRICS_AUDIO_PROFILE=low_latency.
+AUDIO_PROFILE_ENV = "LYRICS_AUDIO_PROFILE"
+AUDIO_PROFILE = os.environ.get(AUDIO_PROFILE_ENV, "default")
+
+# frequency en Hz, size en bits (negativo = con signo), channels, buffer en muestras
+AUDIO_PROFILES: Dict[str, Optional[Dict[str, int]]] = {
+    "default": None,
+    "low_latency": {"frequency": 48000, "size": -16, "channels": 2, "buffer": 256},
+    "safe": {"frequency": 44100, "size": -16, "channels": 2, "buffer": 1024},
+}
+
+# Aquí se guarda el offset medido por perfil (segundos)
+CALIBRATION_FILE = Path(__file__).parent / "assets" / "audio_latency.json"
+
+# Parámetros de la calibración
+CALIBRATION_BEATS = 12
+CALIBRATION_WARMUP = 3        # primeros golpes que no cuentan
+CALIBRATION_INTERVAL = 0.75   # segundos entre tonos
+TONE_HZ = 1000
+TONE_LENGTH = 0.03
+MAX_OFFSET = 0.5
+
+
+def init_mixer(profile: str = AUDIO_PROFILE):
+    """Inicializa pygame.mixer con el perfil indicado (o los valores por defecto)."""
+    settings = AUDIO_PROFILES.get(profile)
+    if settings is None:
+        pygame.mixer.init()
+    else:
+        pygame.mixer.init(**settings)
+
+
+def estimated_buffer_latency(profile: str = AUDIO_PROFILE) -> float:
+    """Latencia mínima que aporta el buffer del mixer ya inicializado con `profile`."""
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0.0
+    frequency = init[0]
+    settings = AUDIO_PROFILES.get(profile) or {}
+    buffer = settings.get("buffer", 512)
+    return buffer / frequency
+
+
+def _load_calibration() -> Dict[str, Any]:
+    if not CALIBRATION_FILE.exists():
+        return {}
+    try:
+        with CALIBRATION_FILE.open(encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_output_offset(profile: str = AUDIO_PROFILE) -> float:
+    """
+    Devuelve el retardo de salida (segundos) que hay que sumar al reloj de letras.
+    Si el perfil no se ha calibrado se usa la estimación del buffer.
+    """
+    data = _load_calibration()
+    entry = data.get(profile)
+    if entry and "output_offset" in entry:
+        return float(entry["output_offset"])
+    return estimated_buffer_latency(profile)
+
+
+def save_output_offset(offset: float, profile: str = AUDIO_PROFILE):
+    data = _load_calibration()
+    data[profile] = {"output_offset": round(offset, 4), "calibrated_at": time.time()}
+    CALIBRATION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with CALIBRATION_FILE.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def build_test_tone() -> Optional[pygame.mixer.Sound]:
+    """
+    Genera un tono corto (beep) en el formato actual del mixer.
+    Solo sabe escribir muestras de 16 bits con signo: con otro formato devuelve None.
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    if size != -16:
+        return None
+    n_samples = int(frequency * TONE_LENGTH)
+    samples = array("h")
+    for i in range(n_samples):
+        # onda cuadrada simple, suficiente para marcar el golpe
+        value = 12000 if (i * TONE_HZ * 2 // frequency) % 2 == 0 else -12000
+        samples.extend([value] * channels)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+def calibrate_output_latency(profile: str = AUDIO_PROFILE) -> Optional[float]:
+    """
+    Reproduce un tono de prueba a intervalos regulares y mide cuándo lo escucha el
+    usuario (pulsando ENTER al ritmo). La mediana de la diferencia entre la orden de
+    reproducción y la pulsación es el retardo real de salida.
+    """
+    # si el mixer ya estaba abierto con otro perfil, init_mixer no cambiaría nada
+    pygame.mixer.quit()
+    init_mixer(profile)
+    tone = build_test_tone()
+    if tone is None:
+        size = pygame.mixer.get_init()[1]
+        console.print(f"[bold red]El mixer usa muestras de {abs(size)} bits; la calibración necesita 16 bits "
+                      f"con signo. Prueba con otro perfil de audio.[/bold red]")
+        return None
+
+    taps: List[float] = []
+    stop = threading.Event()
+
+    def read_taps():
+        while not stop.is_set():
+            try:
+                input()
+            except EOFError:
+                return
+            taps.append(time.perf_counter())
+
+    console.print("[bold cyan]Pulsa ENTER justo cuando escuches cada tono.[/bold cyan]")
+    console.print("[cyan]Los primeros golpes son de práctica.[/cyan]\n")
+    time.sleep(1.0)
+
+    reader = threading.Thread(target=read_taps, daemon=True)
+    reader.start()
+
+    beats: List[float] = []
+    start = time.perf_counter() + 0.5
+    for k in range(CALIBRATION_BEATS):
+        target = start + k * CALIBRATION_INTERVAL
+        wait = target - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        beats.append(time.perf_counter())
+        tone.play()
+    time.sleep(CALIBRATION_INTERVAL)
+    stop.set()
+
+    # emparejamos cada golpe con la pulsación más cercana dentro de medio intervalo
+    offsets = []
+    for beat in beats[CALIBRATION_WARMUP:]:
+        candidates = [t - beat for t in taps if abs(t - beat) < CALIBRATION_INTERVAL / 2]
+        if candidates:
+            offsets.append(min(candidates, key=abs))
+
+    if len(offsets) < 3:
+        console.print("[bold red]No hubo suficientes pulsaciones para calibrar.[/bold red]")
+        return None
+
+    offset = min(max(statistics.median(offsets), 0.0), MAX_OFFSET)
+    save_output_offset(offset, profile)
+    console.print(f"[bold green]Retardo de salida medido ({profile}): {offset * 1000:.0f} ms[/bold green]")
+    return offset
+
+
+if __name__ == "__main__":
+    console.print(f"[bold yellow]Calibrando perfil de audio: {AUDIO_PROFILE}[/bold yellow]")
+    calibrate_output_latency(AUDIO_PROFILE)
@@ -0,0 +1,234 @@
+# Marcas <mm:ss.xx> automáticas para LRC que solo traen tiempos de línea
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from rich.console import Console
+
+from lrc_parser import LRC_LINE_TS_RE, LRC_WORD_TS_RE, to_seconds
+
+console = Console()
+
+# Frecuencia y ventanas del análisis (mono, 22 kHz sobra para detectar ataques de la voz)
+ANALYSIS_RATE = 22050
+FRAME_SIZE = 1024
+HOP_SIZE = 256
+# Ventanas por bloque del STFT: acota la memoria (bloque x FRAME_SIZE float32) en pistas largas
+ONSET_BLOCK_FRAMES = 2048
+# Umbral adaptativo: media móvil de la envolvente (segundos) + margen
+THRESHOLD_WINDOW = 0.5
+THRESHOLD_DELTA = 0.05
+# Como mucho, cuánto se busca alrededor de la posición esperada de cada palabra
+SNAP_TOLERANCE = 0.35
+# Separación mínima entre dos palabras (segundos)
+MIN_WORD_GAP = 0.08
+# Última línea y líneas seguidas de un instrumental largo
+LAST_LINE_DURATION = 3.0
+MAX_LINE_SPAN = 8.0
+
+# Sufijo del LRC generado (sample.lrc -> sample_auto.lrc). No usa punto para que
+# find_extra_lrc_files no lo confunda con una capa de traducción.
+OUTPUT_SUFFIX = "_auto"
+
+
+def load_mono(audio_file: Path) -> np.ndarray:
+    """Decodifica la pista con pygame a mono float32 a ANALYSIS_RATE."""
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    pygame.mixer.quit()
+    # allowedchanges=0: SDL convierte a este formato en vez de abrir otro distinto
+    pygame.mixer.init(frequency=ANALYSIS_RATE, size=-16, channels=1, allowedchanges=0)
+    try:
+        raw = pygame.mixer.Sound(str(audio_file)).get_raw()
+    finally:
+        pygame.mixer.quit()
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def onset_envelope(samples: np.ndarray) -> np.ndarray:
+    """
+    Flujo espectral: suma de los aumentos de magnitud (log) entre ventanas seguidas.
+    Vectorizado por bloques de ONSET_BLOCK_FRAMES ventanas (una rfft por bloque, en float32);
+    el último espectro de cada bloque se guarda para la diferencia con el siguiente.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < FRAME_SIZE:
+        samples = np.pad(samples, (0, FRAME_SIZE - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    flux = np.zeros(len(frames), dtype=np.float32)
+    prev: Optional[np.ndarray] = None
+    for start in range(0, len(frames), ONSET_BLOCK_FRAMES):
+        block = frames[start:start + ONSET_BLOCK_FRAMES] * window
+        spectrum = np.log1p(100.0 * np.abs(np.fft.rfft(block, axis=1)).astype(np.float32))
+        if prev is not None:
+            spectrum_diff = np.diff(np.vstack((prev, spectrum)), axis=0)
+        else:
+            spectrum_diff = np.vstack((np.zeros_like(spectrum[:1]), np.diff(spectrum, axis=0)))
+        flux[start:start + len(block)] = np.maximum(spectrum_diff, 0.0).sum(axis=1)
+        prev = spectrum[-1:]
+    peak = flux.max()
+    return flux / peak if peak > 0 else flux
+
+
+def detect_onsets(envelope: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Máximos locales por encima del umbral adaptativo -> (tiempos, fuerza)."""
+    if len(envelope) < 3:
+        return np.empty(0), np.empty(0)
+    width = max(int(THRESHOLD_WINDOW * ANALYSIS_RATE / HOP_SIZE), 1)
+    threshold = np.convolve(envelope, np.ones(width) / width, mode="same") + THRESHOLD_DELTA
+    mid = envelope[1:-1]
+    is_peak = (mid > envelope[:-2]) & (mid >= envelope[2:]) & (mid > threshold[1:-1])
+    idx = np.flatnonzero(is_peak) + 1
+    # el centro de la ventana es donde cae el ataque
+    times = (idx * HOP_SIZE + FRAME_SIZE / 2) / ANALYSIS_RATE
+    return times, envelope[idx]
+
+
+def assign_word_times(words: Sequence[str], start: float, end: float,
+                      onset_times: np.ndarray, onset_strength: np.ndarray) -> List[float]:
+    """
+    Reparte las palabras de una línea entre start y end. Cada palabra tiene una
+    posición esperada (proporcional a su longitud) y se engancha al ataque más
+    fuerte cercano; si no hay ninguno se queda en la posición esperada.
+    """
+    if len(words) <= 1:
+        return [start]
+    lengths = np.array([len(w) + 1 for w in words], dtype=np.float64)
+    expected = start + (end - start) * np.cumsum(lengths)[:-1] / lengths.sum()
+
+    lo, hi = np.searchsorted(onset_times, [start + MIN_WORD_GAP, end - MIN_WORD_GAP])
+    cand_t = onset_times[lo:hi]
+    cand_s = onset_strength[lo:hi]
+
+    times = [start]
+    for i, target in enumerate(expected):
+        # que sigan en orden y dejen sitio a las palabras que faltan
+        floor = times[-1] + MIN_WORD_GAP
+        ceiling = end - MIN_WORD_GAP * (len(expected) - i)
+        near = (np.abs(cand_t - target) <= SNAP_TOLERANCE) & (cand_t >= floor) & (cand_t <= ceiling)
+        if near.any():
+            # fuerza penalizada por la distancia a la posición esperada
+            score = cand_s[near] * (1.0 - np.abs(cand_t[near] - target) / (2 * SNAP_TOLERANCE))
+            times.append(float(cand_t[near][np.argmax(score)]))
+        else:
+            times.append(float(min(max(target, floor), max(ceiling, floor))))
+    return times
+
+
+def _format_ts(t: float) -> str:
+    cs = int(round(max(t, 0.0) * 100))
+    m, cs = divmod(cs, 6000)
+    return f"{m:02d}:{cs // 100:02d}.{cs % 100:02d}"
+
+
+def enhance_lrc(lrc_text: str, onset_times: np.ndarray, onset_strength: np.ndarray) -> Tuple[str, int]:
+    """
+    Devuelve el LRC con marcas <..> en las líneas que solo tenían [..] y cuántas
+    líneas se marcaron. Las líneas con varias marcas [t1][t2] se separan en una
+    línea por aparición: cada una se ajusta a sus propios onsets (el parser
+    solo desplazaría las <..> de la primera).
+    """
+    raw_lines = lrc_text.splitlines()
+    starts = sorted(
+        to_seconds(m, s) for raw in raw_lines for m, s in LRC_LINE_TS_RE.findall(raw)
+    )
+
+    def line_end(t: float) -> float:
+        i = int(np.searchsorted(starts, t, side="right"))
+        nxt = starts[i] if i < len(starts) else t + LAST_LINE_DURATION
+        return min(nxt, t + MAX_LINE_SPAN)
+
+    out: List[str] = []
+    enhanced = 0
+    for raw in raw_lines:
+        tags = list(LRC_LINE_TS_RE.finditer(raw))
+        if not tags or LRC_WORD_TS_RE.search(raw):
+            out.append(raw)
+            continue
+        words = LRC_LINE_TS_RE.split(raw)[-1].split()
+        if len(words) < 2:
+            out.append(raw)
+            continue
+        for tag in tags:
+            start = to_seconds(*tag.groups())
+            times = assign_word_times(words, start, line_end(start), onset_times, onset_strength)
+            body = " ".join(
+                word if i == 0 else f"<{_format_ts(t)}>{word}"
+                for i, (t, word) in enumerate(zip(times, words))
+            )
+            out.append(f"{tag.group(0)}{body}")
+            enhanced += 1
+    return "\n".join(out) + "\n", enhanced
+
+
+def process_track(audio_file: Path, lrc_file: Path, output: Optional[Path] = None) -> Tuple[Path, int]:
+    """Analiza una pista y escribe su LRC con marcas de palabra."""
+    output = output or lrc_file.with_name(f"{lrc_file.stem}{OUTPUT_SUFFIX}.lrc")
+    times, strength = detect_onsets(onset_envelope(load_mono(audio_file)))
+    text, enhanced = enhance_lrc(lrc_file.read_text(encoding="utf-8"), times, strength)
+    output.write_text(text, encoding="utf-8")
+    return output, enhanced
+
+
+def _track_job(pair: Tuple[str, str]) -> Tuple[str, int, Optional[str]]:
+    audio, lrc = pair
+    try:
+        output, enhanced = process_track(Path(audio), Path(lrc))
+        return str(output), enhanced, None
+    except Exception as e:  # pygame.error y compañía: que no tumbe el resto del álbum
+        return lrc, 0, str(e)
+
+
+def find_pairs(folder: Path) -> List[Tuple[Path, Path]]:
+    """Empareja cada audio de la carpeta con el LRC del mismo nombre."""
+    pairs = []
+    for audio in sorted(folder.iterdir()):
+        if audio.suffix.lower() not in (".mp3", ".ogg", ".wav", ".flac"):
+            continue
+        lrc = audio.with_suffix(".lrc")
+        if lrc.exists():
+            pairs.append((audio, lrc))
+    return pairs
+
+
+def process_album(pairs: Sequence[Tuple[Path, Path]], workers: Optional[int] = None):
+    """Una pista por proceso: el análisis de cada una es independiente."""
+    jobs = [(str(a), str(l)) for a, l in pairs]
+    if not jobs:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        return [_track_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_track_job, jobs))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Genera marcas <mm:ss.xx> por palabra a partir del audio.")
+    parser.add_argument("source", type=Path, help="carpeta con audio + LRC, o un audio")
+    parser.add_argument("lrc", type=Path, nargs="?", help="LRC de la pista (si source es un audio)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos en paralelo")
+    args = parser.parse_args(argv)
+
+    if args.source.is_dir():
+        pairs = find_pairs(args.source)
+    else:
+        pairs = [(args.source, args.lrc or args.source.with_suffix(".lrc"))]
+
+    if not pairs:
+        console.print("[bold yellow]No se encontró ningún audio con su LRC.[/bold yellow]")
+        return
+    for output, enhanced, err in process_album(pairs, args.workers):
+        if err:
+            console.print(f"[bold red]Error en {output}:[/bold red] {err}")
+        else:
+            console.print(f"[green]{output}:[/green] {enhanced} líneas con marcas de palabra")
+
+
+if __name__ == "__main__":
+    main()
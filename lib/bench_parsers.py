@@ -0,0 +1,381 @@
+# Benchmark de los parsers LRC con archivos sintéticos
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+LIB_DIR = Path(__file__).parent
+RESULTS_DIR = LIB_DIR / "assets" / "benchmarks"
+
+DEFAULT_SIZES = (10_000, 100_000)
+FULL_SIZES = (10_000, 100_000, 1_000_000)
+REPEATS = 3
+# En --compare, a partir de qué diferencia se marca como regresión
+REGRESSION_THRESHOLD = 0.10
+# --stress: tiempo máximo por caso y por línea en el fuzz
+STRESS_TIME_LIMIT = 3.0
+FUZZ_LINE_LIMIT = 0.05
+# Linealidad: se cuadruplica la entrada y se compara el tiempo por marca (mínimo de
+# LINEAR_RUNS, intercalando tamaños). Lineal da ~1; cuadrático daría ~4.
+LINEAR_SIZES = (25_000, 100_000)
+LINEAR_RUNS = 7
+LINEAR_RATIO_LIMIT = 2.0
+
+WORDS = ("te", "conocí", "en", "un", "bazar", "sábado", "al", "mediodía", "entre", "la",
+         "gente", "y", "los", "puestos", "amor", "por", "siempre", "noche", "luz", "canción")
+
+
+# ---------------------------------------------------------------------------
+# Generadores de LRC sintéticos
+# ---------------------------------------------------------------------------
+
+def _ts(t: float) -> str:
+    cs = int(round(t * 100))
+    m, cs = divmod(cs, 6000)
+    return f"{m:02d}:{cs // 100:02d}.{cs % 100:02d}"
+
+
+def _words(rng: random.Random, n: int) -> List[str]:
+    return [rng.choice(WORDS) for _ in range(n)]
+
+
+def gen_plain(n: int, rng: random.Random) -> Iterable[str]:
+    """Solo marcas de línea: el caso más común."""
+    for i in range(n):
+        yield f"[{_ts(i * 2.5)}]{' '.join(_words(rng, rng.randint(3, 9)))}"
+
+
+def gen_repeats(n: int, rng: random.Random) -> Iterable[str]:
+    """Estribillos [t1][t2][t3]: cada línea cruda genera varios eventos."""
+    i = 0
+    while i < n:
+        k = rng.randint(2, 4)
+        tags = "".join(f"[{_ts((i + j * 7) * 2.5)}]" for j in range(k))
+        yield f"{tags}{' '.join(_words(rng, rng.randint(3, 9)))}"
+        i += k
+
+
+def gen_words(n: int, rng: random.Random) -> Iterable[str]:
+    """Marcas <..> en cada palabra (modo palabra por palabra)."""
+    for i in range(n):
+        start = i * 2.5
+        words = _words(rng, rng.randint(4, 12))
+        step = 2.4 / len(words)
+        body = " ".join(w if j == 0 else f"<{_ts(start + j * step)}>{w}" for j, w in enumerate(words))
+        yield f"[{_ts(start)}]{body}"
+
+
+def gen_metadata(n: int, rng: random.Random) -> Iterable[str]:
+    """Cabecera enorme de metadatos y comentarios antes de la letra."""
+    for i in range(n // 2):
+        yield f"[{rng.choice(('ti', 'ar', 'al', 'by', 're', 've'))}:{' '.join(_words(rng, 4))} {i}]"
+        if i % 10 == 0:
+            yield ""
+    yield from gen_plain(n - n // 2, rng)
+
+
+GENERATORS: Dict[str, Callable[[int, random.Random], Iterable[str]]] = {
+    "plain": gen_plain,
+    "repeats": gen_repeats,
+    "words": gen_words,
+    "metadata": gen_metadata,
+}
+
+
+def write_synthetic(path: Path, kind: str, n: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as f:
+        for line in GENERATORS[kind](n, rng):
+            f.write(line + "\n")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Parsers a medir
+# ---------------------------------------------------------------------------
+
+def load_parsers() -> Dict[str, Callable[[Path], Iterable[Any]]]:
+    """Nombre -> función que recibe la ruta y devuelve (o va entregando) eventos."""
+    import lrc_parser
+
+    parsers = {
+        "lrc_parser (rc4/rc5)": lrc_parser.parse_lrc,
+        "lrc_parser stream": lrc_parser.iter_lrc_events,
+    }
+    return parsers
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+
+def _consume(result: Iterable[Any]) -> int:
+    """Recorre el resultado (lista o generador) y cuenta eventos."""
+    if isinstance(result, list):
+        return len(result)
+    count = 0
+    for _ in result:
+        count += 1
+    return count
+
+
+def measure(parse: Callable[[Path], Iterable[Any]], path: Path, raw_lines: int,
+            repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Mejor de `repeats` para el tiempo total y el tiempo hasta el primer evento;
+    la memoria pico se mide aparte porque tracemalloc frena el parser.
+    """
+    best_total = best_first = float("inf")
+    events = 0
+    for _ in range(repeats):
+        gc.collect()
+        t0 = time.perf_counter()
+        it = iter(parse(path))
+        first = next(it, None)
+        t_first = time.perf_counter() - t0
+        events = (first is not None) + _consume(it)
+        total = time.perf_counter() - t0
+        best_total = min(best_total, total)
+        best_first = min(best_first, t_first)
+
+    gc.collect()
+    tracemalloc.start()
+    _consume(parse(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "events": events,
+        "seconds": best_total,
+        "lines_per_s": raw_lines / best_total if best_total > 0 else 0.0,
+        "first_event_ms": best_first * 1000,
+        "peak_mib": peak / 1024 ** 2,
+    }
+
+
+@contextlib.contextmanager
+def parser_limits(**limits):
+    """Cambia temporalmente los límites de lrc_parser (None = sin límite)."""
+    import lrc_parser
+
+    saved = {name: getattr(lrc_parser, name) for name in limits}
+    for name, value in limits.items():
+        setattr(lrc_parser, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(lrc_parser, name, value)
+
+
+def run(sizes: Sequence[int], kinds: Sequence[str], parsers: Dict[str, Callable],
+        repeats: int = REPEATS) -> List[Dict[str, Any]]:
+    results = []
+    # el rendimiento se mide sin recortes (los archivos de 1M líneas pasan MAX_EVENTS)
+    unlimited = parser_limits(MAX_EVENTS=None, MAX_FILE_CHARS=None)
+    with unlimited, tempfile.TemporaryDirectory() as tmp:
+        for kind in kinds:
+            for n in sizes:
+                path = write_synthetic(Path(tmp) / f"{kind}_{n}.lrc", kind, n)
+                with path.open(encoding="utf-8") as f:
+                    raw_lines = sum(1 for _ in f)
+                for name, parse in parsers.items():
+                    console.print(f"[dim]{kind} · {n} · {name}…[/dim]", end="\r")
+                    row = {"parser": name, "workload": kind, "size": n, "raw_lines": raw_lines}
+                    row.update(measure(parse, path, raw_lines, repeats))
+                    results.append(row)
+    return results
+
+
+def _key(row: Dict[str, Any]):
+    return row["parser"], row["workload"], row["size"]
+
+
+def show(results: List[Dict[str, Any]], baseline: Optional[List[Dict[str, Any]]] = None):
+    previous = {_key(row): row for row in baseline or []}
+    table = Table(title="Parsers LRC")
+    for col in ("parser", "carga", "líneas", "líneas/s", "1er evento", "pico MiB"):
+        table.add_column(col, justify="left" if col in ("parser", "carga") else "right")
+    if previous:
+        table.add_column("vs. base", justify="right")
+
+    for row in results:
+        cells = [row["parser"], row["workload"], f"{row['size']:,}", f"{row['lines_per_s']:,.0f}",
+                 f"{row['first_event_ms']:.1f} ms", f"{row['peak_mib']:.1f}"]
+        old = previous.get(_key(row))
+        if previous:
+            if old and old["lines_per_s"] > 0:
+                change = row["lines_per_s"] / old["lines_per_s"] - 1
+                color = "red" if change < -REGRESSION_THRESHOLD else "green" if change > REGRESSION_THRESHOLD else "white"
+                cells.append(f"[{color}]{change:+.0%}[/{color}]")
+            else:
+                cells.append("—")
+        table.add_row(*cells)
+    console.print(table)
+
+
+# ---------------------------------------------------------------------------
+# Estrés y fuzz del parser endurecido (lrc_parser)
+# ---------------------------------------------------------------------------
+
+def _write_lines(path: Path, lines: Iterable[str]) -> Path:
+    with path.open("w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+    return path
+
+
+# nombre -> (generador de líneas, si debe quedar aviso de recorte en el reporte)
+STRESS_CASES: Dict[str, Tuple[Callable[[], Iterable[str]], bool]] = {
+    "línea de 20M caracteres": (lambda: ["[00:01.00]" + "a" * 20_000_000], True),
+    "100k marcas [..] en una línea": (lambda: ["[00:01.00]" * 100_000 + "hola"], True),
+    "líneas llenas de <..>": (lambda: ["[00:01.00]" + "<00:01.50>x" * 400] * 2_000, True),
+    "corchetes anidados": (lambda: ["[" * 4000 + "00:01]"] * 5_000, False),
+    "dígitos sin cerrar": (lambda: ["[" + "9" * 4000] * 5_000, False),
+    "basura binaria": (lambda: [bytes(range(256)).decode("latin-1") * 16] * 2_000, False),
+    "2M eventos": (lambda: (f"[{_ts(i / 100)}]a" for i in range(2_000_000)), True),
+}
+
+
+def _fuzz_line(rng: random.Random) -> str:
+    alphabet = "[]<>:.0123456789 aé\t"
+    n = rng.choice((8, 64, 512, 4096, 20_000))
+    line = "".join(rng.choice(alphabet) for _ in range(n))
+    if rng.random() < 0.5:
+        line = f"[{_ts(rng.random() * 300)}]" + line
+    return line
+
+
+def _scan_time(line: str) -> float:
+    import lrc_parser
+
+    t0 = time.perf_counter()
+    lrc_parser.parse_lrc_line(line)
+    return time.perf_counter() - t0
+
+
+def stress(fuzz_lines: int, seed: int = 0) -> bool:
+    """
+    Casos patológicos con los límites por defecto: ninguno puede pasar de
+    STRESS_TIME_LIMIT ni lanzar excepción, y los que se recortan deben avisar.
+    Después, fuzz de líneas aleatorias y comprobación de que, al cuadruplicar una
+    línea patológica (sin límites), el tiempo por marca no crece más de
+    LINEAR_RATIO_LIMIT veces.
+    """
+    import lrc_parser
+
+    table = Table(title="Estrés del parser")
+    for col in ("caso", "tiempo", "eventos", "avisos", ""):
+        table.add_column(col)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (make, truncated) in STRESS_CASES.items():
+            path = _write_lines(Path(tmp) / "stress.lrc", make())
+            report: List[str] = []
+            t0 = time.perf_counter()
+            try:
+                events = len(lrc_parser.parse_lrc(path, report))
+                error = None
+            except Exception as e:
+                events, error = 0, e
+            elapsed = time.perf_counter() - t0
+            passed = error is None and elapsed <= STRESS_TIME_LIMIT and bool(report) == truncated
+            ok &= passed
+            table.add_row(name, f"{elapsed:.2f} s", f"{events:,}", str(len(report)),
+                          "[green]ok[/green]" if passed else f"[red]FALLO[/red] {error or ''}")
+
+    rng = random.Random(seed)
+    worst = 0.0
+    for _ in range(fuzz_lines):
+        line = _fuzz_line(rng)
+        try:
+            worst = max(worst, _scan_time(line))
+        except Exception as e:
+            ok = False
+            table.add_row("fuzz", "—", "—", "—", f"[red]FALLO[/red] {e!r} con {line[:40]!r}")
+            break
+    passed = worst <= FUZZ_LINE_LIMIT
+    ok &= passed
+    table.add_row(f"fuzz ({fuzz_lines:,} líneas)", f"peor {worst * 1000:.1f} ms", "—", "—",
+                  "[green]ok[/green]" if passed else "[red]FALLO[/red]")
+
+    small_n, big_n = LINEAR_SIZES
+    with parser_limits(MAX_LINE_LENGTH=None, MAX_TAGS_PER_LINE=None):
+        for name, unit in (("marcas [..]", "[00:01.00]"), ("marcas <..>", "<00:01.00>x"), ("basura", "[9:<.")):
+            small_line = "[00:00.00]" + unit * small_n
+            big_line = "[00:00.00]" + unit * big_n
+            small = big = float("inf")
+            for _ in range(LINEAR_RUNS):
+                small = min(small, _scan_time(small_line))
+                big = min(big, _scan_time(big_line))
+            ratio = (big / big_n) / (small / small_n) if small > 0 else 0.0
+            passed = ratio <= LINEAR_RATIO_LIMIT
+            ok &= passed
+            table.add_row(f"lineal: {name} ×{big_n // small_n}", f"×{ratio:.2f} por marca", "—", "—",
+                          "[green]ok[/green]" if passed else "[red]FALLO[/red]")
+    console.print(table)
+    return ok
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Mide los parsers LRC con archivos sintéticos.")
+    parser.add_argument("--sizes", default=None,
+                        help="líneas por archivo separadas por comas (por defecto 10000,100000)")
+    parser.add_argument("--full", action="store_true", help="incluye el archivo de 1M líneas")
+    parser.add_argument("--workloads", default=",".join(GENERATORS), help="plain,repeats,words,metadata")
+    parser.add_argument("--parsers", default=None, help="solo los parsers cuyo nombre contenga estos textos")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", type=Path, default=None, help="JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparar")
+    parser.add_argument("--stress", action="store_true",
+                        help="casos patológicos y fuzz del parser con límites de tiempo (código 1 si falla)")
+    parser.add_argument("--fuzz-lines", type=int, default=2000, help="líneas aleatorias en --stress")
+    args = parser.parse_args(argv)
+
+    if args.stress:
+        sys.exit(0 if stress(args.fuzz_lines) else 1)
+
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = FULL_SIZES if args.full else DEFAULT_SIZES
+    kinds = [k for k in args.workloads.split(",") if k in GENERATORS]
+    parsers = load_parsers()
+    if args.parsers:
+        wanted = args.parsers.split(",")
+        parsers = {name: fn for name, fn in parsers.items() if any(w in name for w in wanted)}
+
+    results = run(sizes, kinds, parsers, args.repeats)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+    show(results, baseline)
+
+    output = args.output or RESULTS_DIR / f"parsers_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "at": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }, indent=2), encoding="utf-8")
+    console.print(f"[dim]Resultados en {output}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
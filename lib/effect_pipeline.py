@@ -0,0 +1,343 @@
+# Pipeline de efectos compartido: un parseo, un calendario y etapas combinables
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from rich.color import ColorSystem
+from rich.console import Console
+from rich.style import Style
+from rich.text import Text
+
+from lrc_layers import end_line_with_layers, layer_style, print_frame_with_layers
+from lrc_parser import parse_lrc, parse_lrc_line
+from reveal_schedule import build_reveal_schedule, line_slice, visible_state
+
+Styles = Union[str, Style, List[str], List[Style]]
+
+# Duración que se da a la última línea (y mínimos para no revelar de golpe)
+LAST_LINE_DURATION = 3.0
+MIN_LINE_DURATION = 0.5
+MIN_CHAR_DELAY = 0.02
+
+CYCLE_COLORS = ["bold red", "bold yellow", "bold green", "bold cyan", "bold magenta"]
+
+# Cada modo clásico es una combinación de etapas
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "rc1": {"reveal": "line", "color": "cycle", "align": "center"},
+    "rc2": {"reveal": "char", "color": "gradient", "align": "center",
+            "gradient": ("#ffd54f", "#ff6e40"), "pending": "grey37"},
+    "rc3": {"reveal": "char", "color": "cycle", "align": "center"},
+    "rc4": {"reveal": "segment", "color": "cycle", "align": "center"},
+    "rc5": {"reveal": "char", "color": "cycle", "align": "center"},
+}
+DEFAULTS: Dict[str, Any] = {
+    "reveal": "char", "color": "cycle", "align": "center",
+    "gradient": ("#ffeb3b", "#ff3d00"), "pending": None, "style": "bold white",
+}
+
+
+def preset_config(name: str, **overrides) -> Dict[str, Any]:
+    config = {**DEFAULTS, **PRESETS[name]}
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    return config
+
+
+# ---------------------------------------------------------------------------
+# Texto y calendario (una sola vez por canción)
+# ---------------------------------------------------------------------------
+
+def display_segments(segments: Sequence[Tuple[float, str]]) -> List[Tuple[float, str]]:
+    """
+    Segmentos <..> con el separador incluido al principio, para que el texto
+    mostrado sea exactamente la concatenación (sin espacio antes de puntuación).
+    """
+    out = []
+    for i, (ts, seg) in enumerate(segments):
+        if i and seg and seg[0] not in ",.;:!?)]}":
+            seg = " " + seg
+        out.append((ts, seg))
+    return out
+
+
+def line_text(entry: Dict[str, Any]) -> str:
+    if entry["inline"]:
+        return "".join(seg for _, seg in display_segments(entry["inline"]))
+    return entry["text"] or ""
+
+
+def _segment_delays(seg_line: np.ndarray, seg_start: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Delay por letra de cada segmento <..>: el hueco hasta el siguiente de la línea (0.5 s el último)."""
+    same_line = np.append(seg_line[1:] == seg_line[:-1], False)
+    gaps = np.append(np.diff(seg_start), 0.0)
+    durations = np.where(same_line, np.maximum(gaps, 0.05), MIN_LINE_DURATION)
+    return np.maximum(durations / np.maximum(lengths, 1), MIN_CHAR_DELAY)
+
+
+def build_schedule(lines: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Instante de aparición de cada carácter de la canción. Las líneas sin <..> se
+    reparten letra por letra en su duración; en las que tienen marcas cada
+    segmento empieza en su tiempo y se revela letra a letra hasta el siguiente.
+    Todas las etapas de revelado (línea, palabra, letra) salen de este calendario.
+    """
+    starts = np.fromiter((e["start"] for e in lines), dtype=np.float64, count=len(lines))
+    durations = np.append(np.maximum(np.diff(starts), MIN_LINE_DURATION), LAST_LINE_DURATION)
+
+    seg_line: List[int] = []
+    seg_start: List[float] = []
+    seg_text: List[str] = []
+    is_word: List[bool] = []
+    for idx, entry in enumerate(lines):
+        if entry["inline"]:
+            for ts, seg in display_segments(entry["inline"]):
+                seg_line.append(idx)
+                seg_start.append(ts)
+                seg_text.append(seg)
+                is_word.append(True)
+        else:
+            seg_line.append(idx)
+            seg_start.append(starts[idx])
+            seg_text.append(entry["text"] or "")
+            is_word.append(False)
+
+    seg_line_a = np.asarray(seg_line, dtype=np.int64)
+    seg_start_a = np.asarray(seg_start, dtype=np.float64)
+    lengths = np.fromiter((len(t) for t in seg_text), dtype=np.float64, count=len(seg_text))
+    letter_delay = np.maximum(durations[seg_line_a] / np.maximum(lengths, 1), MIN_CHAR_DELAY)
+    seg_delay = np.where(is_word, _segment_delays(seg_line_a, seg_start_a, lengths), letter_delay)
+    return build_reveal_schedule(starts, seg_line_a, seg_start_a, seg_delay, seg_text)
+
+
+# ---------------------------------------------------------------------------
+# Etapas
+# ---------------------------------------------------------------------------
+
+# Revelado: (texto, tiempos por carácter, segmento por carácter, inicio, ¿tiene <..>?)
+# -> (tiempos, caracteres visibles)
+RevealStage = Callable[[str, np.ndarray, np.ndarray, float, bool], Tuple[np.ndarray, np.ndarray]]
+
+
+def reveal_line(text, char_times, char_segment, start, inline):
+    if not text:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    return np.array([start]), np.array([len(text)])
+
+
+def reveal_word(text, char_times, char_segment, start, inline):
+    """Palabra a palabra; en líneas con <..> cada segmento entero."""
+    n = len(text)
+    if not n:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    if inline:
+        first = np.flatnonzero(np.append(True, char_segment[1:] != char_segment[:-1]))
+    else:
+        is_space = codes == 32
+        first = np.flatnonzero(~is_space & np.append(True, is_space[:-1]))
+        if not len(first):
+            return np.array([start]), np.array([n])
+    # cada unidad acaba en su último carácter visible (sin el espacio de después)
+    nonspace = np.flatnonzero(codes != 32)
+    if not len(nonspace):
+        return np.array([start]), np.array([n])
+    ends = nonspace[np.searchsorted(nonspace, np.append(first[1:], n)) - 1] + 1
+    return char_times[first], ends
+
+
+def reveal_char(text, char_times, char_segment, start, inline):
+    return char_times, np.arange(1, len(text) + 1)
+
+
+def reveal_segment(text, char_times, char_segment, start, inline):
+    """Las líneas con <..> por segmentos enteros; las que no tienen, letra a letra (rc4)."""
+    if inline:
+        return reveal_word(text, char_times, char_segment, start, inline)
+    return reveal_char(text, char_times, char_segment, start, inline)
+
+
+REVEAL_STAGES: Dict[str, RevealStage] = {
+    "line": reveal_line, "word": reveal_word, "segment": reveal_segment, "char": reveal_char,
+}
+# De más fina a más gruesa: el gobernador de calidad solo puede mover hacia la derecha
+REVEAL_ORDER = ("char", "segment", "word", "line")
+
+
+def _hex_to_rgb(h: str) -> np.ndarray:
+    h = h.lstrip("#")
+    return np.array([int(h[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float64)
+
+
+def gradient_colors(n: int, start_hex: str, end_hex: str, stops: Optional[int] = None) -> List[str]:
+    """Degradado lineal por carácter (vectorizado); con stops, solo esa cantidad de colores distintos."""
+    if n == 0:
+        return []
+    t = np.linspace(0.0, 1.0, n) if n > 1 else np.zeros(1)
+    if stops is not None and stops < n:
+        steps = max(stops - 1, 1)
+        t = np.round(t * steps) / steps
+    c1, c2 = _hex_to_rgb(start_hex), _hex_to_rgb(end_hex)
+    rgb = (c1 + (c2 - c1) * t[:, None]).astype(int)
+    return ["#{:02x}{:02x}{:02x}".format(*c) for c in rgb]
+
+
+# Color: (texto, índice de línea, config) -> un estilo o uno por carácter
+def color_cycle(text: str, idx: int, config: Dict[str, Any]) -> Styles:
+    return CYCLE_COLORS[idx % len(CYCLE_COLORS)]
+
+
+def color_fixed(text: str, idx: int, config: Dict[str, Any]) -> Styles:
+    return config["style"]
+
+
+def color_gradient(text: str, idx: int, config: Dict[str, Any]) -> Styles:
+    return gradient_colors(len(text), *config["gradient"], stops=config.get("gradient_stops"))
+
+
+COLOR_STAGES: Dict[str, Callable[[str, int, Dict[str, Any]], Styles]] = {
+    "cycle": color_cycle, "fixed": color_fixed, "gradient": color_gradient,
+}
+
+
+def align_padding(align: str, width: int, length: int) -> int:
+    if align == "center":
+        return max((width - length) // 2, 0)
+    if align == "right":
+        return max(width - length, 0)
+    return 0
+
+
+ALIGN_STAGES = ("left", "center", "right")
+
+
+@lru_cache(maxsize=1024)
+def _eight_bit(style: str) -> Style:
+    parsed = Style.parse(style)
+    if parsed.color is None:
+        return parsed
+    return parsed + Style(color=parsed.color.downgrade(ColorSystem.EIGHT_BIT))
+
+
+def downgrade_colors(styles: Styles) -> Styles:
+    """Pasa los colores a la paleta de 256 (secuencias más cortas que truecolor)."""
+    if isinstance(styles, str):
+        return _eight_bit(styles)
+    return [_eight_bit(style) for style in styles]
+
+
+def compose_frame(text: str, visible: int, styles: Styles, padding: int, pending: Optional[str]) -> Text:
+    """Frame final: relleno de alineación + parte revelada con su color (+ resto en tenue)."""
+    frame = Text(" " * padding)
+    if not isinstance(styles, list):
+        frame.append(text[:visible], style=styles)
+    else:
+        # un tramo por cada racha de caracteres con el mismo estilo
+        for style, run in groupby(zip(text[:visible], styles), key=itemgetter(1)):
+            frame.append("".join(ch for ch, _ in run), style=style)
+    if pending:
+        frame.append(text[visible:], style=pending)
+    return frame
+
+
+# ---------------------------------------------------------------------------
+# Estrategia para el motor
+# ---------------------------------------------------------------------------
+
+class PipelineStrategy:
+    """
+    Une las etapas elegidas en config (revelado, color, alineación) y las aplica
+    sobre el calendario común. Cambiar config en caliente solo afecta a las
+    líneas que se construyan después (el motor invalida las ya preparadas).
+
+    quality son los recortes del gobernador de calidad (revelado más grueso,
+    menos colores en el degradado, 256 colores); se aplican encima de config.
+    """
+
+    parse_line = staticmethod(parse_lrc_line)
+    parse_lrc = staticmethod(parse_lrc)
+
+    def __init__(self, config: Dict[str, Any], console: Console):
+        self.config = config
+        self.console = console
+        self.schedule: Optional[Dict[str, np.ndarray]] = None
+        self.quality: Dict[str, Any] = {}
+
+    @staticmethod
+    def key(entry) -> float:
+        return entry["start"]
+
+    def configure(self, **changes):
+        self.config = {**self.config, **changes}
+
+    def set_quality(self, settings: Dict[str, Any]):
+        self.quality = settings
+
+    def effective_config(self) -> Dict[str, Any]:
+        config, quality = self.config, self.quality
+        if not quality:
+            return config
+        reveal = max(config["reveal"], quality.get("reveal", "char"), key=REVEAL_ORDER.index)
+        return {**config, "reveal": reveal, "gradient_stops": quality.get("gradient_stops"),
+                "color_system": quality.get("color_system", "truecolor")}
+
+    def prepare(self, lines: Sequence[Dict[str, Any]]):
+        self.schedule = build_schedule(lines) if lines else None
+
+    def visible_at(self, t: float) -> Tuple[int, int, int]:
+        """(línea, caracteres revelados, palabra) en el instante t, para saltar o re-sincronizar."""
+        if self.schedule is None:
+            return -1, 0, -1
+        return visible_state(self.schedule, t)
+
+    def _aligned(self, text: str, style: str) -> Text:
+        return Text(" " * align_padding(self.config["align"], self.console.width, len(text)) + text, style=style)
+
+    def layer_text(self, layer: int, entry) -> Text:
+        return self._aligned(entry["text"], layer_style(layer))
+
+    def _char_timing(self, idx: int, entry, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        schedule = self.schedule
+        if schedule is not None and idx + 1 < len(schedule["line_offset"]):
+            span = line_slice(schedule, idx)
+            if span.stop - span.start == len(text):
+                return schedule["time"][span], schedule["segment"][span]
+        # el calendario cambió por debajo (recarga): la línea se muestra entera
+        return np.full(len(text), entry["start"]), np.zeros(len(text), dtype=np.int32)
+
+    def build(self, idx: int, entry) -> Dict[str, Any]:
+        """Todo lo que el render necesita de una línea, listo para escribir."""
+        config = self.effective_config()
+        text = line_text(entry)
+        char_times, char_segment = self._char_timing(idx, entry, text)
+        times, counts = REVEAL_STAGES[config["reveal"]](text, char_times, char_segment, entry["start"],
+                                                        bool(entry["inline"]))
+        styles = COLOR_STAGES[config["color"]](text, idx, config)
+        if config.get("color_system") == "256":
+            styles = downgrade_colors(styles)
+        pending = config.get("pending")
+        width = self.console.width
+
+        def frame(visible: int) -> Text:
+            # con `pending` se ve la línea completa, así que se alinea entera
+            length = len(text) if pending else visible
+            return compose_frame(text, visible, styles, align_padding(config["align"], width, length), pending)
+
+        return {
+            "times": times,
+            "frames": [frame(int(c)) for c in counts],
+            "blank": frame(0),
+            "final": frame(len(text)),
+        }
+
+    # --- escritura ---
+    def begin(self, rendered, below: Sequence[Text]):
+        if below or self.config.get("pending"):
+            # las capas (y la línea en tenue) aparecen ya al empezar la línea
+            print_frame_with_layers(self.console, rendered["blank"], below)
+
+    def show(self, rendered, revealed: int, below: Sequence[Text]):
+        print_frame_with_layers(self.console, rendered["frames"][revealed - 1], below)
+
+    def end(self, rendered, below: Sequence[Text]):
+        end_line_with_layers(self.console, below, rendered["final"])
@@ -0,0 +1,227 @@
+# Exportador masivo de LRC a SRT, WebVTT y ASS (karaoke con \k)
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from rich.console import Console
+
+from effect_pipeline import display_segments, line_text
+from lrc_parser import iter_lrc_events
+
+console = Console()
+
+FORMATS = ("srt", "vtt", "ass")
+
+# Duración de la última línea (igual que en los modos de reproducción)
+LAST_LINE_DURATION = 3.0
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 1920
+PlayResY: 1080
+WrapStyle: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,64,&H0000D5FF,&H00FFFFFF,&H00000000,&H64000000,-1,0,0,0,100,100,0,0,1,3,0,2,60,60,80,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def _srt_time(t: float) -> str:
+    ms = int(round(max(t, 0.0) * 1000))
+    h, ms = divmod(ms, 3600000)
+    m, ms = divmod(ms, 60000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def _vtt_time(t: float) -> str:
+    return _srt_time(t).replace(",", ".")
+
+
+def _ass_time(t: float) -> str:
+    cs = int(round(max(t, 0.0) * 100))
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h:d}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+# \N, \n y \h son saltos y espacios duros en ASS; una "\" suelta se muestra tal cual
+ASS_OVERRIDE_RE = re.compile(r"\\(?=[Nnh])")
+
+
+def _ass_escape(text: str) -> str:
+    # {..} abriría un bloque de override; en \N se mete un WORD JOINER invisible tras la barra
+    text = text.replace("{", "(").replace("}", ")")
+    return ASS_OVERRIDE_RE.sub("\\\\\u2060", text)
+
+
+def _vtt_escape(text: str) -> str:
+    # en el texto de un cue &, < y > tienen significado (entidades, etiquetas y "-->")
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def format_srt(n: int, start: float, end: float, entry: Dict[str, Any]) -> str:
+    # el mismo texto que se ve en pantalla (entry["text"] conserva los espacios de las <..>)
+    return f"{n}\n{_srt_time(start)} --> {_srt_time(end)}\n{line_text(entry)}\n\n"
+
+
+def _split_lead(seg: str) -> Tuple[str, str]:
+    """(separador, texto) de un segmento de display_segments: el separador va antes de la marca."""
+    body = seg.lstrip(" ")
+    return seg[:len(seg) - len(body)], body
+
+
+def format_vtt(n: int, start: float, end: float, entry: Dict[str, Any]) -> str:
+    """WebVTT admite marcas de tiempo dentro del cue: las usamos para las palabras."""
+    segments = entry["inline"]
+    if segments:
+        parts = []
+        for i, (ts, seg) in enumerate(display_segments(segments)):
+            lead, body = _split_lead(seg)
+            body = _vtt_escape(body)
+            parts.append(lead + (body if i == 0 else f"<{_vtt_time(ts)}>{body}"))
+        text = "".join(parts)
+    else:
+        text = _vtt_escape(entry["text"])
+    return f"{_vtt_time(start)} --> {_vtt_time(end)}\n{text}\n\n"
+
+
+def format_ass(n: int, start: float, end: float, entry: Dict[str, Any]) -> str:
+    """Dialogue con \\k: cada segmento dura hasta el siguiente (centésimas)."""
+    segments = display_segments(entry["inline"]) if entry["inline"] else [(start, entry["text"])]
+    parts = []
+    # si el primer segmento empieza tarde, el hueco inicial va sin texto
+    lead = int(round((segments[0][0] - start) * 100))
+    if lead > 0:
+        parts.append(f"{{\\k{lead}}}")
+    for i, (ts, seg) in enumerate(segments):
+        seg_end = segments[i + 1][0] if i + 1 < len(segments) else end
+        duration = max(int(round((seg_end - ts) * 100)), 0)
+        sep, body = _split_lead(seg)
+        parts.append(f"{sep}{{\\k{duration}}}{_ass_escape(body)}")
+    return f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Default,,0,0,0,,{''.join(parts)}\n"
+
+
+FORMATTERS = {"srt": format_srt, "vtt": format_vtt, "ass": format_ass}
+HEADERS = {"srt": "", "vtt": "WEBVTT\n\n", "ass": ASS_HEADER}
+
+
+def _cues(events: Iterator[Dict[str, Any]]) -> Iterator[Tuple[float, float, Dict[str, Any]]]:
+    """(inicio, fin, evento): cada línea dura hasta la siguiente; se mira solo un evento adelante."""
+    prev: Optional[Dict[str, Any]] = None
+    for entry in events:
+        if prev is not None:
+            yield prev["start"], entry["start"], prev
+        prev = entry
+    if prev is not None:
+        yield prev["start"], prev["start"] + LAST_LINE_DURATION, prev
+
+
+def export_file(src: Path, out_base: Path, formats: Sequence[str] = FORMATS) -> int:
+    """
+    Convierte un LRC a los formatos pedidos en una sola pasada en streaming.
+    Escribe out_base.<fmt> y devuelve el número de cues.
+    """
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        outs: Dict[str, TextIO] = {}
+        for fmt in formats:
+            f = stack.enter_context(open(f"{out_base}.{fmt}", "w", encoding="utf-8"))
+            f.write(HEADERS[fmt])
+            outs[fmt] = f
+        n = 0
+        for start, end, entry in _cues(iter_lrc_events(src)):
+            if not entry["text"]:
+                # las líneas vacías solo marcan el final de la anterior
+                continue
+            n += 1
+            for fmt, f in outs.items():
+                f.write(FORMATTERS[fmt](n, start, end, entry))
+    return n
+
+
+def _export_job(job: Tuple[str, str, Tuple[str, ...]]) -> Tuple[str, int, Optional[str]]:
+    src, out_base, formats = job
+    try:
+        return src, export_file(Path(src), Path(out_base), formats), None
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return src, 0, str(e)
+
+
+def _find_lrc_files(root: Path) -> Iterator[Path]:
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.name.lower().endswith(".lrc"):
+                    yield Path(entry.path)
+
+
+def export_directory(src_dir: Path, out_dir: Path, formats: Sequence[str] = FORMATS,
+                     workers: Optional[int] = None) -> List[Tuple[str, int, Optional[str]]]:
+    """
+    Convierte todos los LRC de src_dir (recursivo) repartiéndolos en un pool de
+    procesos. La estructura de carpetas se replica en out_dir.
+    """
+    jobs = [
+        (str(path), str(out_dir / path.relative_to(src_dir).with_suffix("")), tuple(formats))
+        for path in _find_lrc_files(src_dir)
+    ]
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(len(jobs) // (workers * 8), 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_export_job, jobs, chunksize=chunksize))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Exporta LRC a SRT, WebVTT y ASS (karaoke).")
+    parser.add_argument("source", type=Path, help="archivo .lrc o carpeta con LRC")
+    parser.add_argument("output", type=Path, help="carpeta de salida")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help="formatos separados por comas (srt,vtt,ass)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos en paralelo")
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in FORMATTERS]
+    if unknown:
+        parser.error(f"formatos no soportados: {', '.join(unknown)}")
+
+    if args.source.is_file():
+        src, n, err = _export_job((str(args.source), str(args.output / args.source.stem), tuple(formats)))
+        if err:
+            console.print(f"[bold red]Error en {src}:[/bold red] {err}")
+            sys.exit(1)
+        console.print(f"[green]{src}: {n} líneas[/green]")
+        return
+    if not args.source.is_dir():
+        parser.error(f"no existe: {args.source}")
+
+    try:
+        results = export_directory(args.source, args.output, formats, args.workers)
+    except OSError as e:
+        console.print(f"[bold red]Error leyendo {args.source}:[/bold red] {e}")
+        sys.exit(1)
+    failed = [(src, err) for src, _, err in results if err]
+    for src, err in failed:
+        console.print(f"[bold red]Error en {src}:[/bold red] {err}")
+    console.print(f"[green]{len(results) - len(failed)} archivos exportados[/green], {len(failed)} con error.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# Instante de arranque del modo: los scripts de entrada lo importan antes que nada
+import time
+
+# Se toma antes de cargar rich, numpy o pygame (cientos de ms); startup.py mide
+# todos los hitos desde aquí. Si ningún script lo importó antes, vale el primer uso.
+LAUNCH_TIME = time.perf_counter()
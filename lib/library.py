@@ -0,0 +1,344 @@
+# Biblioteca de canciones en la terminal: escaneo con caché y búsqueda difusa
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+# Carpetas de música configuradas (como audio_latency.json, es configuración del usuario)
+CONFIG_FILE = ASSETS_DIR / "library.json"
+# Índice del escaneo: se regenera solo lo que cambió
+INDEX_FILE = ASSETS_DIR / "cache" / "library_index.json"
+INDEX_VERSION = 1
+
+AUDIO_EXTENSIONS = (".mp3",)
+LRC_EXTENSION = ".lrc"
+DEFAULT_DIRS = (Path.home() / "Music", Path.home() / "Música")
+RESULTS_SHOWN = 20
+
+Track = Tuple[Path, Path]   # (audio, lrc)
+
+
+# ---------------------------------------------------------------------------
+# Configuración
+# ---------------------------------------------------------------------------
+
+def load_music_dirs() -> List[Path]:
+    """Carpetas configuradas; si no hay ninguna, las de música del sistema que existan."""
+    try:
+        with CONFIG_FILE.open(encoding="utf-8") as f:
+            dirs = json.load(f).get("music_dirs", [])
+    except (OSError, ValueError):
+        dirs = []
+    if dirs:
+        return [Path(d) for d in dirs]
+    return [d for d in DEFAULT_DIRS if d.is_dir()]
+
+
+def save_music_dirs(dirs: Sequence[Path]):
+    CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with CONFIG_FILE.open("w", encoding="utf-8") as f:
+        json.dump({"music_dirs": [str(d) for d in dirs]}, f, indent=2, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Escaneo con caché por carpeta
+# ---------------------------------------------------------------------------
+
+def _load_index() -> Dict[str, Any]:
+    try:
+        with INDEX_FILE.open(encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("dirs", {})
+
+
+def _save_index(dirs: Dict[str, Any]):
+    INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_FILE.with_suffix(".tmp")
+    # json.dumps usa el codificador en C; json.dump escribe a trozos desde Python
+    tmp.write_text(json.dumps({"version": INDEX_VERSION, "dirs": dirs}, ensure_ascii=False, separators=(",", ":")),
+                   encoding="utf-8")
+    os.replace(tmp, INDEX_FILE)
+
+
+def _list_dir(path: str) -> Dict[str, Any]:
+    """Una pasada de os.scandir: subcarpetas, audios y LRC de la carpeta."""
+    subdirs, audio, lrc = [], [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(name)
+                        continue
+                except OSError:
+                    continue
+                ext = os.path.splitext(name)[1].lower()
+                if ext in AUDIO_EXTENSIONS:
+                    audio.append(name)
+                elif ext == LRC_EXTENSION:
+                    lrc.append(name)
+    except OSError:
+        pass
+    return {"subdirs": subdirs, "audio": audio, "lrc": lrc}
+
+
+def scan(roots: Sequence[Path], cached: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Recorre las carpetas y devuelve (índice, carpetas releídas). Añadir, borrar o
+    renombrar un archivo cambia el mtime de su carpeta, así que las que conservan
+    el mtime del índice no se vuelven a listar: solo se les hace un stat.
+    """
+    cached = cached or {}
+    dirs: Dict[str, Any] = {}
+    rescanned = 0
+    stack = [os.path.abspath(r) for r in roots]
+    while stack:
+        path = stack.pop()
+        if path in dirs:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        entry = cached.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, **_list_dir(path)}
+            rescanned += 1
+        dirs[path] = entry
+        stack.extend(os.path.join(path, name) for name in entry["subdirs"])
+    return dirs, rescanned
+
+
+def pair_tracks(dirs: Dict[str, Any], roots: Sequence[Path]) -> Tuple[List[Tuple[str, str]], List[str], int]:
+    """
+    Empareja cada audio con el LRC del mismo nombre. Devuelve los pares (como
+    str: con 50k canciones crear Path cuesta más que todo lo demás), su nombre
+    para mostrar (ruta relativa a su carpeta raíz, sin extensión) y cuántos
+    audios se quedaron sin LRC.
+    """
+    root_dirs = sorted((os.path.abspath(r) for r in roots), key=len, reverse=True)
+    rows = []
+    missing = 0
+    for path, entry in dirs.items():
+        # todos los nombres del índice tienen extensión (se filtraron por ella)
+        lrcs = {name[:name.rfind(".")].lower(): name for name in entry["lrc"]}
+        root = next((r for r in root_dirs if path == r or path.startswith(r + os.sep)), None)
+        prefix = "" if root is None or path == root else path[len(root) + 1:] + os.sep
+        folder = path + os.sep
+        for name in entry["audio"]:
+            stem = name[:name.rfind(".")]
+            lrc = lrcs.get(stem.lower())
+            if lrc is None:
+                missing += 1
+                continue
+            rows.append((prefix + stem, folder + name, folder + lrc))
+    rows.sort(key=lambda row: row[0].lower())
+    return [(audio, lrc) for _, audio, lrc in rows], [label for label, _, _ in rows], missing
+
+
+# ---------------------------------------------------------------------------
+# Búsqueda difusa
+# ---------------------------------------------------------------------------
+
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin tildes, para que "cancion" encuentre "Canción"."""
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text.lower()))
+
+
+class Library:
+    """
+    Pares audio/LRC de las carpetas configuradas. Los nombres normalizados van
+    juntos en un solo texto, uno por línea: cada término de la búsqueda es un
+    único regex sobre ese texto (en C) y el resto se hace con numpy.
+    """
+
+    def __init__(self, roots: Sequence[Path], tracks: Sequence[Tuple[str, str]],
+                 labels: Sequence[str], missing: int = 0):
+        self.roots = list(roots)
+        self.tracks = list(tracks)
+        self.labels = list(labels)
+        self.missing = missing
+        self._keys = normalize("\n".join(label.replace("\n", " ") for label in self.labels)).split("\n")
+        self._key_length = np.fromiter(map(len, self._keys), dtype=np.int64, count=len(self._keys))
+        self._masks = self._char_masks(self._keys)
+
+    @classmethod
+    def load(cls, roots: Optional[Sequence[Path]] = None, rescan: bool = False) -> "Library":
+        roots = load_music_dirs() if roots is None else roots
+        cached = None if rescan else _load_index()
+        dirs, rescanned = scan(roots, cached)
+        if rescanned or cached is None or len(dirs) != len(cached):
+            _save_index(dirs)
+        return cls(roots, *pair_tracks(dirs, roots))
+
+    def track(self, i: int) -> Track:
+        audio, lrc = self.tracks[i]
+        return Path(audio), Path(lrc)
+
+    @staticmethod
+    def _char_bits(codes: np.ndarray) -> np.ndarray:
+        """Un bit por carácter: a-z y 0-9 tienen el suyo, el resto comparte los 27 últimos."""
+        bits = np.where((codes >= 97) & (codes <= 122), codes - 97,
+                        np.where((codes >= 48) & (codes <= 57), codes - 48 + 26, 37 + codes % 27))
+        return np.left_shift(np.uint64(1), bits.astype(np.uint64))
+
+    @classmethod
+    def _char_masks(cls, keys: Sequence[str]) -> np.ndarray:
+        """Máscara de los caracteres de cada nombre, para descartar sin regex."""
+        if not keys:
+            return np.empty(0, dtype=np.uint64)
+        codes = np.frombuffer("".join(keys).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        masks = np.zeros(len(keys), dtype=np.uint64)
+        filled = lengths > 0
+        masks[filled] = np.bitwise_or.reduceat(cls._char_bits(codes), offsets[filled])
+        return masks
+
+    def _scan(self, candidates: np.ndarray, pattern) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pasa el patrón sobre los nombres candidatos (juntos, uno por línea) y
+        devuelve (posición en candidates, largo del grupo 1) de cada acierto.
+        """
+        keys = self._keys
+        lengths = self._key_length[candidates] + 1
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        blob = "\n".join([keys[i] for i in candidates.tolist()])
+        spans = [m.span(1) for m in pattern.finditer(blob)]
+        if not spans:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        spans_a = np.asarray(spans, dtype=np.int64)
+        return np.searchsorted(offsets, spans_a[:, 0], side="right") - 1, spans_a[:, 1] - spans_a[:, 0]
+
+    def search(self, query: str, limit: int = RESULTS_SHOWN) -> List[int]:
+        """
+        Índices de las pistas que coinciden, mejores primero. Cada palabra de la
+        consulta tiene que aparecer tal cual o con sus letras en orden ("bhrap"
+        encuentra "Bohemian Rhapsody"); tal cual gana, luego el tramo más corto y
+        luego el nombre más corto.
+        """
+        terms = sorted(normalize(query).split(), key=len, reverse=True)
+        if not terms:
+            return list(range(min(limit, len(self.tracks))))
+        codes = np.frombuffer("".join(terms).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        wanted = np.bitwise_or.reduce(self._char_bits(codes))
+        candidates = np.flatnonzero((self._masks & wanted) == wanted)
+        score = np.zeros(len(candidates), dtype=np.int64)
+        for term in terms:
+            # el término tal cual (el .* consume el resto del nombre: un acierto por nombre)
+            exact, _ = self._scan(candidates, re.compile(f"({re.escape(term)})[^\\n]*"))
+            rest = np.ones(len(candidates), dtype=bool)
+            rest[exact] = False
+            rest = np.flatnonzero(rest)
+            # sus letras en orden; cada hueco no pasa de la siguiente letra, así no hay retrocesos
+            body = re.escape(term[0]) + "".join(f"[^{re.escape(ch)}\\n]*{re.escape(ch)}" for ch in term[1:])
+            fuzzy, spans = self._scan(candidates[rest], re.compile(f"({body})[^\\n]*"))
+            hit = np.concatenate((exact, rest[fuzzy]))
+            if not len(hit):
+                return []
+            candidates = candidates[hit]
+            score = score[hit] + np.concatenate((np.full(len(exact), len(term)), spans + 1))
+        order = np.lexsort((candidates, self._key_length[candidates], score))
+        return candidates[order][:limit].tolist()
+
+
+# ---------------------------------------------------------------------------
+# Navegador en la terminal
+# ---------------------------------------------------------------------------
+
+def _show_results(library: Library, results: Sequence[int], query: str, elapsed: float):
+    if not results:
+        console.print(f"[bold red]Nada coincide con «{query}».[/bold red]")
+        return
+    title = f"🎵 {len(library.tracks):,} canciones"
+    if query:
+        title += f" · {elapsed * 1000:.1f} ms"
+    table = Table(title=title, title_justify="left")
+    table.add_column("#", style="bold green", justify="right")
+    table.add_column("Canción")
+    for n, i in enumerate(results, 1):
+        table.add_row(str(n), library.labels[i])
+    console.print(table)
+
+
+def browse(library: Optional[Library] = None) -> Optional[Track]:
+    """
+    Búsqueda interactiva: se escribe parte del nombre, se elige por número.
+    Vacío o "q" cancela; "r" vuelve a escanear las carpetas.
+    """
+    library = library or Library.load()
+    if not library.roots:
+        console.print("[bold red]No hay carpetas de música configuradas (python lib/library.py --add CARPETA).[/bold red]")
+        return None
+    if library.missing:
+        console.print(f"[dim]{library.missing:,} audios sin LRC al lado no aparecen.[/dim]")
+
+    results = library.search("")
+    _show_results(library, results, "", 0.0)
+    while True:
+        answer = input("🔎 Buscar (número = elegir, r = reescanear, vacío = cancelar): ").strip()
+        if not answer or answer.lower() == "q":
+            return None
+        if answer.isdigit() and 1 <= int(answer) <= len(results):
+            return library.track(results[int(answer) - 1])
+        if answer.lower() == "r":
+            library = Library.load(library.roots, rescan=True)
+            results = library.search("")
+            _show_results(library, results, "", 0.0)
+            continue
+        t0 = time.perf_counter()
+        results = library.search(answer)
+        _show_results(library, results, answer, time.perf_counter() - t0)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Biblioteca de canciones (mp3 + lrc) con búsqueda difusa.")
+    parser.add_argument("query", nargs="*", help="buscar sin entrar al navegador")
+    parser.add_argument("--add", type=Path, action="append", default=[], help="añadir carpeta de música")
+    parser.add_argument("--remove", type=Path, action="append", default=[], help="quitar carpeta de música")
+    parser.add_argument("--rescan", action="store_true", help="ignorar el índice y listar todo de nuevo")
+    args = parser.parse_args(argv)
+
+    if args.add or args.remove:
+        removed = {p.resolve() for p in args.remove}
+        dirs = [d for d in load_music_dirs() if d.resolve() not in removed]
+        dirs += [p.resolve() for p in args.add if p.resolve() not in dirs]
+        save_music_dirs(dirs)
+        console.print(f"Carpetas: {', '.join(map(str, dirs)) or '(ninguna)'}")
+
+    t0 = time.perf_counter()
+    library = Library.load(rescan=args.rescan)
+    console.print(f"[dim]{len(library.tracks):,} canciones indexadas en {time.perf_counter() - t0:.2f} s[/dim]")
+    if args.query:
+        t0 = time.perf_counter()
+        results = library.search(" ".join(args.query))
+        _show_results(library, results, " ".join(args.query), time.perf_counter() - t0)
+    elif not (args.add or args.remove):
+        track = browse(library)
+        if track:
+            console.print(f"{track[0]}\n{track[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Varias pistas de letra a la vez (original + traducción + romanización)
+import glob
+import heapq
+import itertools
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Sequence, Tuple
+
+from rich.console import Console
+from rich.control import Control
+
+# Estilo de cada capa secundaria (la 1 es la primera debajo del original)
+LAYER_STYLES = ["italic grey70", "italic grey50", "italic grey42"]
+
+
+def find_extra_lrc_files(lrc_path: Path) -> List[Path]:
+    """Capas extra junto al LRC principal: sample.lrc -> sample.es.lrc, sample.rom.lrc..."""
+    # el nombre puede traer [ ] (p. ej. "Song [Live]"): no son comodines
+    return sorted(lrc_path.parent.glob(f"{glob.escape(lrc_path.stem)}.*.lrc"))
+
+
+def layer_style(layer: int) -> str:
+    return LAYER_STYLES[min(layer, len(LAYER_STYLES)) - 1]
+
+
+def merge_tracks(timelines: Sequence[Sequence[Any]], key: Callable[[Any], float]) -> Iterator[Tuple[float, int, Any]]:
+    """
+    Mezcla perezosa (heap) de varias líneas de tiempo ya ordenadas, sin reordenar
+    todo de nuevo. Devuelve (timestamp, capa, entrada); a igual tiempo manda la capa
+    con menor índice.
+    """
+    def tagged(layer: int, timeline: Sequence[Any]):
+        for entry in timeline:
+            yield key(entry), layer, entry
+
+    streams = [tagged(layer, timeline) for layer, timeline in enumerate(timelines)]
+    return heapq.merge(*streams, key=lambda item: (item[0], item[1]))
+
+
+def stacked_layers(main: Sequence[Any], extras: Sequence[Sequence[Any]],
+                   key: Callable[[Any], float]) -> Iterator[List[Tuple[int, Any]]]:
+    """
+    Recorre la mezcla y entrega, para cada línea principal en orden, las entradas
+    de las otras capas que caen entre su inicio y el de la siguiente línea
+    principal. Lo anterior a la primera línea se pega a la primera.
+    """
+    below: List[Tuple[int, Any]] = []
+    started = False
+    for _, layer, entry in merge_tracks([main, *extras], key):
+        if layer == 0:
+            if started:
+                yield below
+                below = []
+            started = True
+        else:
+            below.append((layer, entry))
+    if started:
+        yield below
+
+
+def stacked_layers_from(main: Sequence[Any], extras: Sequence[Sequence[Any]],
+                        key: Callable[[Any], float], start: int) -> Iterator[List[Tuple[int, Any]]]:
+    """Como stacked_layers pero empezando en la línea principal `start` (tras re-sincronizar)."""
+    return itertools.islice(stacked_layers(main, extras, key), start, None)
+
+
+def print_frame_with_layers(console: Console, frame, below: Sequence[Any], justify=None):
+    """
+    Escribe un frame de la línea principal con las capas debajo y deja el cursor
+    al inicio de la línea principal, listo para el siguiente frame.
+    """
+    if not below:
+        console.print(frame, end="\r", soft_wrap=False, justify=justify)
+        return
+    console.print(frame, soft_wrap=False, justify=justify)
+    for text in below:
+        console.print(text, soft_wrap=False, justify=justify)
+    console.control(Control.move(0, -(len(below) + 1)))
+
+
+def end_line_with_layers(console: Console, below: Sequence[Any], frame=None, justify=None):
+    """Cierra la línea principal (opcionalmente con su frame final) y salta las capas."""
+    if frame is None:
+        console.print("")
+    else:
+        console.print(frame, soft_wrap=False, justify=justify)
+    if below:
+        console.control(Control.move(0, len(below)))
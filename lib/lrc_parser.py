@@ -0,0 +1,253 @@
+# Parser LRC compartido por los modos palabra por palabra (rc4, rc5)
+import heapq
+import re
+from collections.abc import Sequence
+from pathlib import Path
+from typing import List, Tuple, Dict, Any, Iterator, Optional, Pattern
+
+# Patrones: tiempos de línea [mm:ss.xx] y de palabra <mm:ss.xx>
+# Minutos y segundos están acotados; la fracción admite cualquier número de
+# dígitos (se recorta a FRACTION_DIGITS al convertir). Cada intento de match
+# empieza en un [ o < y solo recorre los dígitos que le siguen, así que
+# escanear una línea sigue siendo lineal en su longitud.
+LRC_LINE_TS_RE = re.compile(r'\[(\d{1,4}):(\d{1,2}(?:\.\d+)?)\]')     # [mm:ss.xx]
+LRC_WORD_TS_RE = re.compile(r'<(\d{1,4}):(\d{1,2}(?:\.\d+)?)>')       # <mm:ss.xx>
+FRACTION_DIGITS = 6
+
+# Límites frente a archivos patológicos (None = sin límite). Al pasarlos se
+# trunca y se anota en el reporte en vez de colgar la carga.
+MAX_LINE_LENGTH = 4096           # caracteres por línea
+MAX_TAGS_PER_LINE = 256          # marcas [..] o <..> por línea
+MAX_EVENTS = 200_000             # eventos en todo el archivo
+MAX_FILE_CHARS = 64 * 1024 ** 2  # caracteres leídos del archivo
+_SKIP_CHUNK = 1 << 16
+
+def to_seconds(m: str, s: str) -> float:
+    """Segundos de una marca a partir de sus grupos (minutos, "ss.xx") de LRC_*_TS_RE."""
+    seconds, dot, fraction = s.partition(".")
+    return int(m) * 60 + float(seconds + dot + fraction[:FRACTION_DIGITS])
+
+class InlineTiming(Sequence):
+    """
+    Segmentos <..> de una aparición de la línea, como (ts absoluto, segmento).
+    Todas las apariciones [t1][t2].. comparten la misma plantilla relativa
+    (desfase desde la primera [..], segmento) y el inicio se suma al leer.
+    """
+    __slots__ = ("template", "start")
+
+    def __init__(self, template: Tuple[Tuple[float, str], ...], start: float):
+        self.template = template
+        self.start = start
+
+    def __len__(self) -> int:
+        return len(self.template)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [(self.start + offset, seg) for offset, seg in self.template[i]]
+        offset, seg = self.template[i]
+        return self.start + offset, seg
+
+    def __iter__(self) -> Iterator[Tuple[float, str]]:
+        start = self.start
+        for offset, seg in self.template:
+            yield start + offset, seg
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"InlineTiming({list(self)!r})"
+
+def _report(report: Optional[List[str]], message: str):
+    if report is not None:
+        report.append(message)
+
+def _scan_tags(s: str, opener: str, pattern: Pattern, report: Optional[List[str]]) -> List[Tuple[float, int, int]]:
+    """
+    Marcas (segundos, inicio, fin) en s en una sola pasada. Con el patrón acotado
+    cada intento de match cuesta O(1), así que finditer es lineal en len(s).
+    """
+    tags: List[Tuple[float, int, int]] = []
+    closer = "]" if opener == "[" else ">"
+    for m in pattern.finditer(s):
+        if MAX_TAGS_PER_LINE is not None and len(tags) >= MAX_TAGS_PER_LINE:
+            _report(report, f"más de {MAX_TAGS_PER_LINE} marcas {opener}..{closer} en una línea; se ignoran las demás")
+            break
+        tags.append((to_seconds(*m.groups()), m.start(), m.end()))
+    return tags
+
+def parse_lrc_line(raw: str, report: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Parsea una sola línea cruda del archivo y devuelve sus eventos (uno por cada
+    marca [..]), sin ordenar. Una línea sin marcas de tiempo no genera eventos.
+    Si se pasa report, ahí se anotan los recortes por los límites.
+    """
+    lines: List[Dict[str, Any]] = []
+    raw = raw.rstrip("\n")
+    if MAX_LINE_LENGTH is not None and len(raw) > MAX_LINE_LENGTH:
+        _report(report, f"línea de {len(raw):,} caracteres truncada a {MAX_LINE_LENGTH:,}")
+        raw = raw[:MAX_LINE_LENGTH]
+    if not raw.strip():
+        return lines
+
+    # Todas las marcas de línea [..]
+    line_tags = _scan_tags(raw, "[", LRC_LINE_TS_RE, report)
+    if not line_tags:
+        # Sin timestamp de línea => ignoramos (metadatos u otros)
+        return lines
+
+    # Texto tras la última ]
+    text_after = raw[line_tags[-1][2]:]
+
+    # Detectar marcas de palabra <..>
+    word_tags = _scan_tags(text_after, "<", LRC_WORD_TS_RE, report)
+
+    # Texto "plano" sin marcas <..> para el modo letra-a-letra
+    pieces = []
+    pos = 0
+    for _, tag_start, tag_end in word_tags:
+        pieces.append(text_after[pos:tag_start])
+        pos = tag_end
+    pieces.append(text_after[pos:])
+    plain_text = "".join(pieces).strip()
+
+    if word_tags:
+        # Hay marcas word-by-word. Las <..> están escritas para la primera [..]:
+        # se guardan una sola vez como desfases relativos a ella.
+        anchor = line_tags[0][0]
+        segments: List[Tuple[float, str]] = []
+
+        # Primer tramo (entre inicio de la línea y el primer <..>): empieza con la línea
+        first_seg = pieces[0].strip()
+        if first_seg:
+            segments.append((0.0, first_seg))
+
+        # Cada <..> abre un tramo que llega hasta la siguiente marca (o el final)
+        for (ts, _, _), seg in zip(word_tags, pieces[1:]):
+            seg = seg.strip()
+            if seg:
+                segments.append((ts - anchor, seg))
+
+        # Ordenamos por tiempo (por seguridad)
+        segments.sort(key=lambda t: t[0])
+        template = tuple(segments)
+
+        # Cada [..] es una aparición: comparte la plantilla desplazada a su inicio
+        for start_ts, _, _ in line_tags:
+            lines.append({
+                "start": start_ts,
+                "text": plain_text,  # texto total sin marcas (solo por referencia)
+                "inline": InlineTiming(template, start_ts)
+            })
+    else:
+        # Sin marcas <..>: cada [..] genera una línea clásica
+        for start_ts, _, _ in line_tags:
+            lines.append({
+                "start": start_ts,
+                "text": plain_text,
+                "inline": None
+            })
+    return lines
+
+def read_lrc_lines(path: Path, report: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Líneas crudas del archivo con memoria acotada: una línea gigante se corta en
+    MAX_LINE_LENGTH y el resto se descarta sin guardarlo; la lectura se detiene
+    al pasar MAX_FILE_CHARS. Los bytes no UTF-8 se sustituyen.
+    """
+    limit = MAX_LINE_LENGTH + 1 if MAX_LINE_LENGTH is not None else -1
+    total = 0
+    with path.open(encoding='utf-8', errors='replace') as f:
+        number = 0
+        while True:
+            raw = f.readline(limit)
+            if not raw:
+                return
+            number += 1
+            total += len(raw)
+            if MAX_LINE_LENGTH is not None and len(raw) > MAX_LINE_LENGTH and not raw.endswith("\n"):
+                skipped = 0
+                while True:
+                    chunk = f.readline(_SKIP_CHUNK)
+                    skipped += len(chunk)
+                    if not chunk or chunk.endswith("\n"):
+                        break
+                total += skipped
+                _report(report, f"línea {number}: {len(raw) + skipped:,} caracteres, truncada a {MAX_LINE_LENGTH:,}")
+                raw = raw[:MAX_LINE_LENGTH]
+            yield raw
+            if MAX_FILE_CHARS is not None and total >= MAX_FILE_CHARS:
+                _report(report, f"archivo de más de {MAX_FILE_CHARS:,} caracteres; se ignora el resto")
+                return
+
+def _capped_events(path: Path, report: Optional[List[str]]) -> Iterator[List[Dict[str, Any]]]:
+    """Eventos de cada línea del archivo, respetando MAX_EVENTS."""
+    count = 0
+    for number, raw in enumerate(read_lrc_lines(path, report), 1):
+        line_report: List[str] = []
+        events = parse_lrc_line(raw, line_report)
+        for message in line_report:
+            _report(report, f"línea {number}: {message}")
+        if not events:
+            continue
+        if MAX_EVENTS is not None and count + len(events) > MAX_EVENTS:
+            _report(report, f"más de {MAX_EVENTS:,} eventos; se ignora el resto del archivo")
+            events = events[:MAX_EVENTS - count]
+            if events:
+                yield events
+            return
+        count += len(events)
+        yield events
+
+def parse_lrc(path: Path, report: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Devuelve una lista de eventos (líneas) ordenados por tiempo.
+
+    Estructura por elemento:
+    - {
+        "start": float,                   # timestamp de inicio de la línea
+        "text": str,                      # texto de la línea sin marcas
+        "inline": Optional[InlineTiming]  # (ts, segmento) si hay marcas <...>
+      }
+
+    Comportamiento:
+    - Soporta varias marcas [..] al inicio (duplicará la línea para cada marca).
+    - Si hay marcas <..> dentro de la línea, se generan segmentos palabra a palabra
+      sincronizados a esos tiempos. El primer segmento usa el tiempo de la primera [..].
+    - En las repeticiones [t1][t2] las <..> se desplazan al inicio de cada aparición
+      (se escriben para la primera); la plantilla de segmentos es una sola.
+    - Tiempo lineal en el tamaño del archivo; lo que pase de los límites (MAX_*)
+      se recorta y se anota en report.
+    """
+    lines: List[Dict[str, Any]] = []
+
+    for events in _capped_events(path, report):
+        lines.extend(events)
+
+    # Ordenamos por tiempo de inicio
+    lines.sort(key=lambda d: d["start"])
+    return lines
+
+def iter_lrc_events(path: Path, report: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Versión en streaming de parse_lrc: lee el archivo línea a línea y va entregando
+    los eventos en orden sin cargar todo en memoria.
+
+    Las repeticiones [t1][t2] quedan en un heap pequeño hasta que el archivo llega
+    a su tiempo. Supone (como casi todos los LRC) que la primera marca de cada
+    línea no retrocede; si retrocede, el evento sale en cuanto se lee.
+    """
+    pending: List[Tuple[float, int, Dict[str, Any]]] = []
+    seq = 0
+    for events in _capped_events(path, report):
+        for event in events:
+            heapq.heappush(pending, (event["start"], seq, event))
+            seq += 1
+        watermark = min(event["start"] for event in events)
+        while pending and pending[0][0] <= watermark:
+            yield heapq.heappop(pending)[2]
+    while pending:
+        yield heapq.heappop(pending)[2]
@@ -0,0 +1,159 @@
+# Recarga en caliente del LRC mientras suena la canción
+import bisect
+import difflib
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+import lrc_parser
+
+# Ponlo en False para no vigilar el archivo durante la reproducción
+HOT_RELOAD = True
+# Cada cuánto se mira si el archivo cambió (segundos)
+POLL_INTERVAL = 0.5
+
+
+class LiveTimeline:
+    """
+    Línea de tiempo ordenada de un LRC que se puede actualizar sin parar el audio.
+
+    Guarda, por cada línea cruda del archivo, los eventos que generó. Al cambiar el
+    archivo solo se re-parsean las líneas modificadas (diff contra la versión
+    anterior) y sus eventos se quitan/insertan en la lista ordenada `entries`,
+    que es la misma lista que usa el bucle de render.
+
+    La lectura y el número de eventos respetan los límites de lrc_parser, también
+    al recargar; lo que se recorte queda anotado en `report` (quien lo muestre
+    puede vaciarlo después de cada carga).
+    """
+
+    def __init__(self, path: Path, parse_line: Callable[[str], List[Any]], key: Callable[[Any], float],
+                 report: Optional[List[str]] = None):
+        self.path = Path(path)
+        self.report: List[str] = report if report is not None else []
+        self._parse_line = parse_line
+        self._key = key
+        self._last_poll = 0.0
+        self._stamp = self._file_stamp()
+        self._raw = self._read_lines()
+        self._by_line = [parse_line(raw) for raw in self._raw]
+        self._capped = self._cap_events()
+        # sort estable: mismo orden que parse_lrc
+        self.entries: List[Any] = sorted((e for events in self._by_line for e in events), key=key)
+        self.keys: List[float] = [key(e) for e in self.entries]
+
+    def _file_stamp(self) -> Tuple[float, int]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return (0.0, -1)
+        return (st.st_mtime, st.st_size)
+
+    def _read_lines(self) -> List[str]:
+        return [raw.rstrip("\n") for raw in lrc_parser.read_lrc_lines(self.path, self.report)]
+
+    def _cap_events(self) -> bool:
+        """Aplica MAX_EVENTS a _by_line; devuelve si hubo que recortar."""
+        if lrc_parser.MAX_EVENTS is None:
+            return False
+        count = 0
+        for i, events in enumerate(self._by_line):
+            if count + len(events) > lrc_parser.MAX_EVENTS:
+                self.report.append(f"más de {lrc_parser.MAX_EVENTS:,} eventos; se ignora el resto del archivo")
+                self._by_line[i] = events[:lrc_parser.MAX_EVENTS - count]
+                for j in range(i + 1, len(self._by_line)):
+                    self._by_line[j] = []
+                return True
+            count += len(events)
+        return False
+
+    def _rebuild(self):
+        """Re-parsea todo y aplica el tope (solo cuando el archivo está o estaba en el límite)."""
+        self._by_line = [self._parse_line(raw) for raw in self._raw]
+        self._capped = self._cap_events()
+        # mismas listas: el bucle de render las tiene referenciadas
+        self.entries[:] = sorted((e for events in self._by_line for e in events), key=self._key)
+        self.keys[:] = [self._key(e) for e in self.entries]
+
+    def index_at(self, t: float) -> int:
+        """Índice de la primera línea que todavía no debería haberse mostrado en t."""
+        return bisect.bisect_right(self.keys, t)
+
+    def poll(self) -> bool:
+        """Comprueba (como mucho cada POLL_INTERVAL) si el archivo cambió y lo aplica."""
+        if not HOT_RELOAD:
+            return False
+        now = time.perf_counter()
+        if now - self._last_poll < POLL_INTERVAL:
+            return False
+        self._last_poll = now
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            new_raw = self._read_lines()
+        except (OSError, UnicodeDecodeError):
+            # el editor puede estar a medio guardar; se reintenta en el próximo poll
+            self._stamp = (0.0, -1)
+            return False
+        return self._apply(new_raw)
+
+    def _apply(self, new_raw: List[str]) -> bool:
+        old_raw = self._raw
+        # recortamos lo común al principio y al final: el diff solo ve la zona editada
+        lo = 0
+        limit = min(len(old_raw), len(new_raw))
+        while lo < limit and old_raw[lo] == new_raw[lo]:
+            lo += 1
+        hi_old, hi_new = len(old_raw), len(new_raw)
+        while hi_old > lo and hi_new > lo and old_raw[hi_old - 1] == new_raw[hi_new - 1]:
+            hi_old -= 1
+            hi_new -= 1
+        if lo == hi_old and lo == hi_new:
+            return False
+
+        matcher = difflib.SequenceMatcher(None, old_raw[lo:hi_old], new_raw[lo:hi_new], autojunk=False)
+        middle: List[List[Any]] = []
+        removed: List[Any] = []
+        added: List[Any] = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                middle.extend(self._by_line[lo + i1:lo + i2])
+                continue
+            for events in self._by_line[lo + i1:lo + i2]:
+                removed.extend(events)
+            for raw in new_raw[lo + j1:lo + j2]:
+                events = self._parse_line(raw)
+                middle.append(events)
+                added.extend(events)
+
+        self._by_line[lo:hi_old] = middle
+        self._raw = new_raw
+        if lrc_parser.MAX_EVENTS is not None and (
+                self._capped or len(self.entries) - len(removed) + len(added) > lrc_parser.MAX_EVENTS):
+            # con el tope en juego el diff no basta: lo que entra depende de todo el archivo
+            self._rebuild()
+            return True
+        for entry in removed:
+            self._remove(entry)
+        for entry in added:
+            self._insert(entry)
+        return bool(removed or added)
+
+    def _remove(self, entry: Any):
+        k = self._key(entry)
+        i = bisect.bisect_left(self.keys, k)
+        while i < len(self.entries) and self.keys[i] == k:
+            if self.entries[i] is entry:
+                del self.entries[i]
+                del self.keys[i]
+                return
+            i += 1
+
+    def _insert(self, entry: Any):
+        k = self._key(entry)
+        i = bisect.bisect_right(self.keys, k)
+        self.keys.insert(i, k)
+        self.entries.insert(i, entry)
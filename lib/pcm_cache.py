@@ -0,0 +1,158 @@
+# Caché persistente de audio decodificado (PCM/WAV) con reproducción desde mmap
+import hashlib
+import mmap
+import os
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Optional
+
+import pygame
+
+# Desactívalo para cargar siempre el mp3 original
+PCM_CACHE_ENABLED = True
+PCM_CACHE_DIR = Path(__file__).parent / "assets" / "cache" / "pcm"
+# Tamaño máximo de la caché; al pasarse se borran las pistas menos usadas
+PCM_CACHE_MAX_BYTES = 2 * 1024 ** 3
+# Un .tmp más viejo que esto (segundos) es de una decodificación cortada (p. ej. al
+# salir con el hilo a medias) y se borra; los más nuevos cuentan para el límite
+STALE_TMP_AGE = 600
+
+# El mmap de la pista actual tiene que vivir mientras suena
+_current_map: Optional[mmap.mmap] = None
+_pending = set()
+_pending_lock = threading.Lock()
+_startup_swept = False
+
+
+def _content_key(audio_file: Path) -> str:
+    """Hash del contenido + formato del mixer (el PCM depende de ambos)."""
+    h = hashlib.sha256()
+    with audio_file.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    frequency, size, channels = pygame.mixer.get_init()
+    return f"{h.hexdigest()[:32]}_{frequency}_{size}_{channels}"
+
+
+def _cache_path(key: str) -> Path:
+    return PCM_CACHE_DIR / f"{key}.wav"
+
+
+def decode_to_wav(audio_file: Path, target: Path) -> bool:
+    """Decodifica la pista una vez con el formato actual del mixer y la guarda como WAV."""
+    frequency, size, channels = pygame.mixer.get_init()
+    if size not in (-16, 8):
+        # WAV PCM solo admite 16 bits con signo u 8 bits sin signo
+        return False
+    raw = pygame.mixer.Sound(str(audio_file)).get_raw()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    try:
+        with wave.open(str(tmp), "wb") as w:
+            w.setnchannels(channels)
+            w.setsampwidth(abs(size) // 8)
+            w.setframerate(frequency)
+            w.writeframes(raw)
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+    evict_lru()
+    return True
+
+
+def evict_lru(max_bytes: int = PCM_CACHE_MAX_BYTES):
+    """
+    Borra los .tmp abandonados y las pistas usadas hace más tiempo hasta quedar
+    por debajo del límite (los .tmp en curso también ocupan y cuentan).
+    """
+    if not PCM_CACHE_DIR.exists():
+        return
+    with _pending_lock:
+        writing = {str(target.with_suffix(".tmp")) for target in _pending}
+    now = time.time()
+    files = []
+    total = 0
+    for entry in os.scandir(PCM_CACHE_DIR):
+        if not entry.is_file():
+            continue
+        if entry.name.endswith(".tmp"):
+            st = entry.stat()
+            if entry.path not in writing and now - st.st_mtime > STALE_TMP_AGE:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+                continue
+            total += st.st_size
+        elif entry.name.endswith(".wav"):
+            st = entry.stat()
+            files.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    files.sort()
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _decode_in_background(audio_file: Path, target: Path):
+    with _pending_lock:
+        if target in _pending:
+            return
+        _pending.add(target)
+
+    def work():
+        try:
+            decode_to_wav(audio_file, target)
+        except (pygame.error, OSError):
+            pass
+        finally:
+            with _pending_lock:
+                _pending.discard(target)
+
+    threading.Thread(target=work, daemon=True).start()
+
+
+def load_music(audio_file: Path):
+    """
+    Carga la pista en pygame.mixer.music. Si ya está en la caché se reproduce el
+    WAV mapeado en memoria (arranque inmediato y posicionamiento exacto); si no,
+    se carga el original y se decodifica en segundo plano para la próxima vez.
+    El mixer tiene que estar inicializado.
+    """
+    global _current_map, _startup_swept
+    audio_file = Path(audio_file)
+    if not PCM_CACHE_ENABLED:
+        pygame.mixer.music.load(str(audio_file))
+        return
+    if not _startup_swept:
+        # restos de ejecuciones anteriores (.tmp cortados, límite rebajado...)
+        _startup_swept = True
+        evict_lru()
+
+    target = _cache_path(_content_key(audio_file))
+    if target.exists():
+        # marcamos el uso para la política LRU
+        os.utime(target)
+        with target.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        pygame.mixer.music.load(mapped, "wav")
+        if _current_map is not None:
+            _current_map.close()
+        _current_map = mapped
+        return
+
+    pygame.mixer.music.load(str(audio_file))
+    _decode_in_background(audio_file, target)
+
+
+def seek(seconds: float):
+    """Salta a una posición de la pista (exacto a nivel de muestra con la caché WAV)."""
+    pygame.mixer.music.play(start=seconds)
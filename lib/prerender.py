@@ -0,0 +1,99 @@
+# Pre-renderizado en segundo plano de los frames de las próximas líneas
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# Cuántas líneas por delante se preparan mientras suena la actual
+PRERENDER_LOOKAHEAD = 3
+
+
+class FramePrefetcher:
+    """
+    Construye en un hilo de trabajo los frames (Text ya estilizados) de las
+    siguientes líneas, para que el bucle de render solo tenga que escribirlos.
+
+    build_fn(idx, item) devuelve los frames de la línea idx; get(idx) los entrega
+    ya listos o, si el hilo no llegó a tiempo, los construye en el momento.
+    """
+
+    def __init__(self, items: Sequence[Any], build_fn: Callable[[int, Any], Any],
+                 lookahead: int = PRERENDER_LOOKAHEAD):
+        self._items = items
+        self._build = build_fn
+        self._lookahead = max(lookahead, 1)
+        self._ready: Dict[int, Any] = {}
+        self._cursor = 0        # línea que está mostrando el render
+        self._next = 0          # próxima línea que construirá el hilo
+        self._building: Optional[int] = None
+        self._generation = 0    # cambia al invalidar; descarta lo que esté a medias
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "FramePrefetcher":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (
+                    self._next >= len(self._items)
+                    or self._next >= self._cursor + self._lookahead
+                ):
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                idx = self._next
+                try:
+                    item = self._items[idx]
+                except IndexError:
+                    # la lista se acortó (recarga del LRC); esperamos al próximo get
+                    self._next = len(self._items)
+                    continue
+                self._building = idx
+                generation = self._generation
+            frames = None
+            try:
+                frames = self._build(idx, item)
+            except Exception:
+                # no se guarda nada: get() la vuelve a construir y el error sale en el render
+                pass
+            finally:
+                with self._cond:
+                    if frames is not None and idx >= self._cursor and generation == self._generation:
+                        self._ready[idx] = frames
+                    self._building = None
+                    self._next = max(self._next, idx + 1)
+                    self._cond.notify_all()
+
+    def get(self, idx: int) -> Any:
+        with self._cond:
+            self._cursor = idx
+            self._next = max(self._next, idx)
+            # lo que ya quedó atrás no se va a mostrar
+            for old in [k for k in self._ready if k < idx]:
+                del self._ready[old]
+            while self._building == idx:
+                self._cond.wait()
+            frames = self._ready.pop(idx, None)
+            if frames is None and self._next == idx:
+                # la construimos aquí; el hilo sigue con la siguiente
+                self._next = idx + 1
+            self._cond.notify_all()
+        if frames is None:
+            frames = self._build(idx, self._items[idx])
+        return frames
+
+    def invalidate(self, idx: int):
+        """Descarta los frames preparados (la lista de líneas cambió) y sigue desde idx."""
+        with self._cond:
+            self._generation += 1
+            self._ready.clear()
+            self._cursor = idx
+            self._next = idx
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
@@ -0,0 +1,202 @@
+# Perfilado opcional de play_and_show (cProfile + tracemalloc) para cualquier modo
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from rich.console import Console
+
+console = Console()
+
+# Se activa con `python lib/rcN.py --profile` o con la variable de entorno
+PROFILE_FLAG = "--profile"
+PROFILE_ENV = "LYRICS_PROFILE"
+LIB_DIR = Path(__file__).parent
+PROFILE_DIR = LIB_DIR / "assets" / "profiles"
+
+# tracemalloc con 1 solo frame por traza: suficiente para ver la línea que
+# asigna y con poco coste. Ponlo en False para medir solo tiempos.
+PROFILE_MEMORY = True
+TRACE_FRAMES = 1
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    argv = sys.argv if argv is None else argv
+    return PROFILE_FLAG in argv or os.environ.get(PROFILE_ENV) == "1"
+
+
+class FrameCounter:
+    """
+    Cuenta los frames de letra pintados (cada PipelineStrategy.show) y, con
+    tracemalloc activo, suma lo que crece la memoria trazada entre un frame y el
+    siguiente: una cota inferior de lo que asigna el bucle de render por frame.
+    También guarda una instantánea de la memoria al arrancar el audio
+    (PlaybackClock.start) para separar lo del bucle de lo de los imports.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.allocated = 0
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self._last = 0
+        self._originals = None
+
+    def install(self):
+        from async_engine import PlaybackClock
+        from effect_pipeline import PipelineStrategy
+
+        show, start = PipelineStrategy.show, PlaybackClock.start
+        self._originals = (show, start)
+        counter = self
+
+        @functools.wraps(show)
+        def counted_show(strategy_self, *args, **kwargs):
+            counter.frames += 1
+            if tracemalloc.is_tracing():
+                current = tracemalloc.get_traced_memory()[0]
+                if current > counter._last:
+                    counter.allocated += current - counter._last
+                counter._last = current
+            return show(strategy_self, *args, **kwargs)
+
+        @functools.wraps(start)
+        def start_with_baseline(clock_self, *args, **kwargs):
+            result = start(clock_self, *args, **kwargs)
+            if tracemalloc.is_tracing() and counter.baseline is None:
+                counter.baseline = tracemalloc.take_snapshot()
+            return result
+
+        PipelineStrategy.show = counted_show
+        PlaybackClock.start = start_with_baseline
+
+    def uninstall(self):
+        if self._originals is not None:
+            from async_engine import PlaybackClock
+            from effect_pipeline import PipelineStrategy
+
+            PipelineStrategy.show, PlaybackClock.start = self._originals
+            self._originals = None
+
+
+class ThreadProfilers:
+    """
+    Hasta Python 3.11 cProfile solo mide el hilo que lo activa: con
+    threading.setprofile cada hilo nuevo (prerender, decodificación a la caché...)
+    arranca su propio perfilador y al final se suman todos. Desde 3.12 cProfile
+    mide todos los hilos por sí solo y esto no hace nada.
+    """
+
+    def __init__(self):
+        self.profilers: List[Tuple[str, cProfile.Profile]] = []
+        self._lock = threading.Lock()
+
+    def _start_thread(self, frame, event, arg):
+        # primer evento del hilo: se cambia este gancho por su perfilador
+        profiler = cProfile.Profile()
+        with self._lock:
+            self.profilers.append((threading.current_thread().name, profiler))
+        profiler.enable()
+
+    def install(self):
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._start_thread)
+
+    def uninstall(self):
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+
+    def merge_into(self, stats: pstats.Stats) -> List[str]:
+        with self._lock:
+            profilers = list(self.profilers)
+        for _, profiler in profilers:
+            profiler.disable()
+            stats.add(profiler)
+        return [name for name, _ in profilers]
+
+
+def _summary(mode: str, stats: pstats.Stats, elapsed: float, counter: FrameCounter,
+             peak: Optional[int], snapshot: Optional[tracemalloc.Snapshot], threads: List[str]) -> str:
+    out = io.StringIO()
+    out.write(f"Perfil de {mode}: {elapsed:.1f} s, {counter.frames} frames\n")
+    if threads:
+        out.write(f"Hilos incluidos: principal, {', '.join(threads)}\n")
+    if peak is not None:
+        out.write(f"Memoria pico: {peak / 1024 ** 2:.1f} MiB\n")
+        if counter.frames:
+            out.write(f"Asignado por frame (aprox.): {counter.allocated / counter.frames / 1024:.1f} KiB\n")
+    out.write(f"\nFunciones con más tiempo acumulado (top {TOP_FUNCTIONS}):\n")
+    stats.stream = out
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    if snapshot is not None:
+        # solo líneas de lib/: lo de los imports (importlib, numpy...) no es del bucle
+        only_lib = (tracemalloc.Filter(True, str(LIB_DIR / "*")), tracemalloc.Filter(False, __file__))
+        snapshot = snapshot.filter_traces(only_lib)
+        if counter.baseline is not None:
+            out.write(f"Líneas de lib/ que más memoria retienen desde que arrancó el audio "
+                      f"(top {TOP_ALLOCATIONS}):\n")
+            top = snapshot.compare_to(counter.baseline.filter_traces(only_lib), "lineno")
+            top = [stat for stat in top if stat.size_diff > 0]
+        else:
+            out.write(f"Líneas de lib/ que más memoria retienen (top {TOP_ALLOCATIONS}):\n")
+            top = snapshot.statistics("lineno")
+        for stat in top[:TOP_ALLOCATIONS]:
+            out.write(f"  {stat}\n")
+    return out.getvalue()
+
+
+def run_profiled(mode: str, fn: Callable, *args, **kwargs):
+    """
+    Ejecuta fn bajo cProfile (y tracemalloc) y guarda en PROFILE_DIR el .prof
+    (para pstats/snakeviz) y un resumen .txt que también se muestra al final.
+    Los hilos que arranquen durante fn se perfilan también (ver ThreadProfilers).
+    """
+    counter = FrameCounter()
+    threads = ThreadProfilers()
+    profiler = cProfile.Profile()
+    if PROFILE_MEMORY:
+        tracemalloc.start(TRACE_FRAMES)
+    counter.install()
+    threads.install()
+    t0 = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+    finally:
+        elapsed = time.perf_counter() - t0
+        threads.uninstall()
+        counter.uninstall()
+        peak = snapshot = None
+        if PROFILE_MEMORY:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        base = PROFILE_DIR / f"{mode}_{time.strftime('%Y%m%d_%H%M%S')}"
+        stats = pstats.Stats(profiler)
+        thread_names = threads.merge_into(stats)
+        stats.dump_stats(f"{base}.prof")
+        summary = _summary(mode, stats, elapsed, counter, peak, snapshot, thread_names)
+        Path(f"{base}.txt").write_text(summary, encoding="utf-8")
+        header = summary.split("\n\n", 1)[0]
+        console.print(f"\n[dim]{header}[/dim]")
+        console.print(f"[dim]Perfil guardado en {base}.prof y {base}.txt[/dim]")
+
+
+def profiled(fn: Callable, mode: str) -> Callable:
+    """fn tal cual, o envuelta en run_profiled si se pidió el perfilado."""
+    if not profiling_requested():
+        return fn
+    return functools.partial(run_profiled, mode, fn)
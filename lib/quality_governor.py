@@ -0,0 +1,105 @@
+# Gobernador de calidad: baja los efectos cuando el render no llega a tiempo
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# El nivel 0 es la calidad completa y cada uno quita algo más.
+# fps: tope de frames por segundo (None = cada carácter en su instante)
+# reveal: granularidad máxima (char -> word -> line); gradient_stops: colores distintos
+# del degradado (None = uno por carácter); color_system: "truecolor" o "256"
+QUALITY_LEVELS: List[Dict[str, Any]] = [
+    {"name": "completa", "fps": None, "reveal": "char", "gradient_stops": None, "color_system": "truecolor"},
+    {"name": "30 fps", "fps": 30, "reveal": "char", "gradient_stops": 16, "color_system": "truecolor"},
+    {"name": "256 colores", "fps": 20, "reveal": "char", "gradient_stops": 8, "color_system": "256"},
+    {"name": "por palabra", "fps": 15, "reveal": "word", "gradient_stops": 4, "color_system": "256"},
+    {"name": "por línea", "fps": 10, "reveal": "line", "gradient_stops": 2, "color_system": "256"},
+]
+
+# Un frame que sale más de esto tarde respecto a su instante es un deadline perdido
+DEADLINE = 0.05
+# Se baja un nivel si en la ventana falla más de esta fracción de frames...
+DOWNGRADE_MISS_RATIO = 0.2
+MIN_WINDOW_FRAMES = 8
+# ...y se sube tras este tiempo sin fallos y con el coste p95 por debajo de HEADROOM del presupuesto
+UPGRADE_AFTER = 8.0
+HEADROOM = 0.25
+FRAME_BUDGET = 1 / 60
+# Tiempo mínimo entre dos cambios (para no oscilar)
+COOLDOWN = 2.0
+
+QUALITY_LOG = Path(__file__).parent / "assets" / "quality_log.jsonl"
+
+
+class QualityGovernor:
+    """
+    Mira el retraso y el coste de cada frame y decide el nivel de QUALITY_LEVELS.
+    El motor le pasa cada frame con observe() y llama a evaluate() periódicamente;
+    si el nivel cambia, evaluate() devuelve el nuevo para aplicarlo.
+    """
+
+    def __init__(self, mode: str, level: int = 0):
+        self.mode = mode
+        self.level = level
+        self.transitions: List[Dict[str, Any]] = []
+        self._lags: List[float] = []
+        self._costs: List[float] = []
+        self._last_change = time.perf_counter()
+        self._clean_since = time.perf_counter()
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return QUALITY_LEVELS[self.level]
+
+    def observe(self, lag: float, cost: float):
+        self._lags.append(lag)
+        self._costs.append(cost)
+
+    def evaluate(self, song_t: float) -> Optional[Dict[str, Any]]:
+        now = time.perf_counter()
+        if len(self._lags) < MIN_WINDOW_FRAMES:
+            # pocos frames (pausa, instrumental): no hay datos para subir ni bajar
+            return None
+        lags = np.asarray(self._lags)
+        costs = np.asarray(self._costs)
+        self._lags.clear()
+        self._costs.clear()
+        misses = float(np.mean(lags > DEADLINE))
+        if misses > 0:
+            self._clean_since = now
+        if now - self._last_change < COOLDOWN:
+            return None
+
+        if misses > DOWNGRADE_MISS_RATIO and self.level + 1 < len(QUALITY_LEVELS):
+            return self._change(self.level + 1, song_t, misses, costs,
+                                f"{misses:.0%} de frames tarde (>{DEADLINE * 1000:.0f}ms)")
+        if not self.level or now - self._clean_since < UPGRADE_AFTER:
+            return None
+        # el nivel de arriba pinta más frames: su presupuesto por frame es menor
+        target_fps = QUALITY_LEVELS[self.level - 1]["fps"]
+        budget = 1 / target_fps if target_fps else FRAME_BUDGET
+        cost_p95 = float(np.percentile(costs, 95))
+        if cost_p95 < HEADROOM * budget:
+            return self._change(self.level - 1, song_t, misses, costs,
+                                f"{UPGRADE_AFTER:.0f}s sin retrasos, coste p95 {cost_p95 * 1000:.1f}ms")
+        return None
+
+    def _change(self, level: int, song_t: float, misses: float, costs: np.ndarray, reason: str) -> Dict[str, Any]:
+        entry = {
+            "mode": self.mode, "at": time.time(), "song_t": round(song_t, 2),
+            "from": QUALITY_LEVELS[self.level]["name"], "to": QUALITY_LEVELS[level]["name"],
+            "miss_ratio": round(misses, 3), "cost_p95_ms": round(float(np.percentile(costs, 95)) * 1000, 2),
+            "reason": reason,
+        }
+        self.level = level
+        self.transitions.append(entry)
+        self._last_change = self._clean_since = time.perf_counter()
+        try:
+            QUALITY_LOG.parent.mkdir(parents=True, exist_ok=True)
+            with QUALITY_LOG.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+        return self.settings
@@ -0,0 +1,104 @@
+# Calendario de revelado precalculado para toda la canción (NumPy)
+import time
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+
+def build_reveal_schedule(line_start: Sequence[float], seg_line: Sequence[int],
+                          seg_start: Sequence[float], seg_delay: Sequence[float],
+                          seg_text: Sequence[str], lead: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Convierte la línea de tiempo en arrays planos, un elemento por carácter:
+
+    - "time":  instante (reloj de la canción) en que aparece el carácter
+    - "line":  índice de la línea a la que pertenece
+    - "word":  índice de la palabra dentro de la línea
+    - "segment": índice del segmento <..> dentro de la línea (0 si no hay)
+    - "line_offset": primer carácter de cada línea (len = líneas + 1)
+    - "line_start": inicio de cada línea
+
+    Cada segmento revela sus caracteres desde seg_start cada seg_delay segundos;
+    lead=1 retrasa el primero un paso (estilo máquina de escribir). Los segmentos
+    deben venir en orden de línea.
+    """
+    line_start = np.asarray(line_start, dtype=np.float64)
+    seg_line = np.asarray(seg_line, dtype=np.int64)
+    seg_start = np.asarray(seg_start, dtype=np.float64)
+    seg_delay = np.asarray(seg_delay, dtype=np.float64)
+    n_lines = len(line_start)
+
+    lengths = np.fromiter((len(t) for t in seg_text), dtype=np.int64, count=len(seg_text))
+    total = int(lengths.sum())
+    seg_of_unit = np.repeat(np.arange(len(lengths)), lengths)
+    first = np.cumsum(lengths) - lengths
+    pos = np.arange(total) - first[seg_of_unit]
+
+    times = seg_start[seg_of_unit] + (pos + lead) * seg_delay[seg_of_unit]
+    # el render es secuencial: ningún carácter aparece antes que el anterior
+    if total:
+        times = np.maximum.accumulate(times)
+
+    # índice del segmento dentro de su línea
+    first_seg_of_line = np.searchsorted(seg_line, np.arange(n_lines))
+    seg_in_line = np.arange(len(lengths)) - first_seg_of_line[seg_line] if len(lengths) else seg_line
+
+    unit_line = seg_line[seg_of_unit]
+    line_offset = np.searchsorted(unit_line, np.arange(n_lines + 1))
+
+    # una palabra empieza en cada carácter no blanco tras un espacio o al empezar un
+    # segmento <..>; los espacios cuentan como parte de la palabra anterior
+    codes = np.frombuffer("".join(seg_text).encode("utf-32-le"), dtype=np.uint32)
+    is_space = codes == 32
+    starts = ~is_space & (np.append(True, is_space[:-1]) | (pos == 0))
+    words_so_far = np.cumsum(starts)
+    before_line = (words_so_far - starts)[line_offset[unit_line]] if total else words_so_far
+    word = np.maximum(words_so_far - before_line - 1, 0)
+
+    return {
+        "time": times,
+        "line": unit_line.astype(np.int32),
+        "word": word.astype(np.int32),
+        "segment": seg_in_line[seg_of_unit].astype(np.int32),
+        "line_offset": line_offset,
+        "line_start": line_start,
+    }
+
+
+def line_slice(schedule: Dict[str, np.ndarray], idx: int) -> slice:
+    offsets = schedule["line_offset"]
+    return slice(int(offsets[idx]), int(offsets[idx + 1]))
+
+
+def visible_state(schedule: Dict[str, np.ndarray], t: float) -> Tuple[int, int, int]:
+    """
+    Estado visible para un instante cualquiera del reloj de la canción:
+    (línea actual, caracteres revelados en ella, palabra actual). Todo con
+    searchsorted, así que saltar o renderizar sin audio no cuesta nada.
+    """
+    line = int(np.searchsorted(schedule["line_start"], t, side="right")) - 1
+    if line < 0:
+        return -1, 0, -1
+    count = int(np.searchsorted(schedule["time"], t, side="right"))
+    a, b = schedule["line_offset"][line], schedule["line_offset"][line + 1]
+    revealed = int(min(max(count - a, 0), b - a))
+    word = int(schedule["word"][a + revealed - 1]) if revealed else -1
+    return line, revealed, word
+
+
+def reveal_frames(times: np.ndarray, now_fn: Callable[[], float], show: Callable[[int], None]):
+    """
+    Bucle de revelado de una línea: show(k) se llama con el número de caracteres
+    visibles cada vez que cambia. Si el render se retrasa se salta directamente
+    al estado correcto en vez de mostrar todos los intermedios.
+    """
+    shown = 0
+    n = len(times)
+    while shown < n:
+        now = now_fn()
+        k = int(np.searchsorted(times, now, side="right"))
+        if k > shown:
+            show(k)
+            shown = k
+            continue
+        time.sleep(min(times[shown] - now, 0.02))
@@ -0,0 +1,60 @@
+# Preparación concurrente de audio y letra + medición del tiempo de arranque
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from rich.console import Console
+
+from audio_latency import init_mixer
+from launch_clock import LAUNCH_TIME
+from pcm_cache import load_music
+
+console = Console()
+
+# Histórico de arranques por modo (una línea JSON por ejecución)
+METRICS_FILE = Path(__file__).parent / "assets" / "startup_metrics.jsonl"
+
+
+def prepare_audio(audio_file: Path):
+    """Inicializa el mixer y deja la pista cargada (lanza excepción si falla)."""
+    init_mixer()
+    load_music(audio_file)
+
+
+def run_concurrently(*tasks: Callable[[], object]) -> List[Future]:
+    """
+    Ejecuta las tareas a la vez en un pool pequeño y espera a que terminen todas.
+    Devuelve los Future para que cada modo trate los errores como prefiera.
+    """
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = [pool.submit(task) for task in tasks]
+    return futures
+
+
+class StartupTimer:
+    """Marca hitos del arranque (segundos desde LAUNCH_TIME) y los reporta al final."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str, delay: float = 0.0):
+        # solo cuenta la primera vez; así se puede llamar dentro del bucle
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - LAUNCH_TIME + delay
+
+    def report(self):
+        audio = self.marks.get("first_audio")
+        lyric = self.marks.get("first_lyric")
+        if audio is None and lyric is None:
+            return
+        parts = [f"{name}={value * 1000:.0f}ms" for name, value in self.marks.items()]
+        console.print(f"[dim]⏱ {self.mode}: {' · '.join(parts)}[/dim]")
+        try:
+            METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with METRICS_FILE.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"mode": self.mode, "at": time.time(), **self.marks}) + "\n")
+        except OSError:
+            pass
@@ -1,8 +1,7 @@
 import os
 import sys
 import shutil
-import tkinter as tk
-from tkinter import filedialog
+from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.align import Align
@@ -15,13 +14,23 @@ ASSETS_PATH = os.path.join(LIB_PATH, "assets")
 
 os.makedirs(ASSETS_PATH, exist_ok=True)
 
+# Los módulos de /lib se importan como en los scripts (python lib/X.py)
+sys.path.insert(0, LIB_PATH)
+import library
+from lrc_layers import find_extra_lrc_files
+
 MENU = {
     "1": ("📂 Modo Estándar Clásico y confiable", "rc1.py"),
     "2": ("🎤 Karaoke Bug ¡Diviértete viendo cómo funciona! 😎", "rc2.py"),
     "3": ("⌛ Compatible con Word by Word Precisión milimétrica 🕰️", "rc4.py"),
     "4": ("⚡ Word by Word Remasterizado Experiencia mejorada 💎", "rc5.py"),
+    "5": ("🎚️ Calibrar latencia de audio Letra y sonido al mismo tiempo 🔊", "audio_latency.py"),
+    "6": ("🎛️ Mezclador de efectos Cambia el estilo mientras suena ⏯️", "async_engine.py"),
 }
 
+# Con "p" se activa/desactiva: los modos se lanzan con --profile (ver lib/profiling.py)
+perfilado = False
+
 
 def clear_console():
     os.system("cls" if os.name == "nt" else "clear")
@@ -32,20 +41,26 @@ def cargar_archivos():
     respuesta = input("👉 ").strip().lower()
 
     if respuesta in ("y", "s"):
-        root = tk.Tk()
-        root.withdraw()  
-        console.print("[bold yellow]Selecciona el archivo MP3[/bold yellow]")
-        mp3_file = filedialog.askopenfilename(filetypes=[("Archivos MP3", "*.mp3")])
-
-        console.print("[bold yellow]Selecciona el archivo LRC[/bold yellow]")
-        lrc_file = filedialog.askopenfilename(filetypes=[("Archivos LRC", "*.lrc")])
-
-        if mp3_file and lrc_file:
+        if not library.load_music_dirs():
+            console.print("[bold yellow]¿En qué carpeta está tu música?[/bold yellow]")
+            carpeta = Path(input("📁 ").strip().strip('"')).expanduser()
+            if carpeta.is_dir():
+                library.save_music_dirs([carpeta.resolve()])
+
+        cancion = library.browse()
+        if cancion:
+            mp3_file, lrc_file = cancion
             shutil.copy(mp3_file, os.path.join(ASSETS_PATH, "sample.mp3"))
             shutil.copy(lrc_file, os.path.join(ASSETS_PATH, "sample.lrc"))
+            # las traducciones (cancion.es.lrc...) viajan con ella; las de la anterior sobran
+            for viejo in find_extra_lrc_files(Path(ASSETS_PATH, "sample.lrc")):
+                viejo.unlink()
+            for capa in find_extra_lrc_files(lrc_file):
+                sufijo = capa.name[len(lrc_file.stem):]
+                shutil.copy(capa, os.path.join(ASSETS_PATH, f"sample{sufijo}"))
             console.print("[bold green]Archivos copiados a /lib/assets como sample.mp3 y sample.lrc[/bold green]")
         else:
-            console.print("[bold red]No se seleccionaron ambos archivos. Continuando...[/bold red]")
+            console.print("[bold red]No se eligió ninguna canción. Continuando...[/bold red]")
 
    
     clear_console()
@@ -65,20 +80,26 @@ def mostrar_menu():
     for key, (texto, _) in MENU.items():
         console.print(Align.center(f"[bold green]{key}[/bold green]. {texto}"))
 
+    estado = "[green]activado[/green]" if perfilado else "[dim]desactivado[/dim]"
+    console.print(Align.center(f"[bold blue]p[/bold blue]. 🔬 Perfilado de rendimiento: {estado}"))
     console.print(Align.center("[bold red]0[/bold red]. Salir"))
 
 
 def ejecutar_opcion(opcion):
+    global perfilado
     if opcion in MENU:
         texto, script_name = MENU[opcion]
         script = os.path.join(LIB_PATH, script_name)
         if os.path.exists(script):
             clear_console() 
             console.print(f"[bold yellow]>>> Ejecutando {texto} Un Momento...[/bold yellow]\n")
-            os.system(f"{sys.executable} {script}")
+            flags = " --profile" if perfilado and script_name.startswith("rc") else ""
+            os.system(f"{sys.executable} {script}{flags}")
             input("✔ Finalizó la ejecución. Presiona ENTER para volver al menú")
         else:
             console.print(f"[bold red]El archivo {script_name} no existe en /lib.[/bold red]")
+    elif opcion.lower() == "p":
+        perfilado = not perfilado
     elif opcion == "0":
         console.print("[bold red]Bye Bye... 👋[/bold red]")
         sys.exit(0)